@@ -0,0 +1,172 @@
+/*
+ * _anchorclean - C fast path for removing empty anchor tags
+ *
+ * Hand-written state machine equivalent to the EMPTY_ANCHOR_PATTERNS regexes
+ * in html_cleaning_patterns.py. An empty anchor is
+ *
+ *     <a WS+ ATTRS WS* > WS* </a>
+ *
+ * where ATTRS is one of  ID,  HREF,  ID WS+ HREF  or  HREF WS+ ID,  with
+ *
+ *     ID   = id=[^WS>]*
+ *     HREF = href=['"]?#['"]?
+ *
+ * Tag and attribute names are matched case-insensitively and WS is the same
+ * set as the bytes regex \s. Matches are found leftmost-first and do not
+ * overlap, so clean() removes exactly what EMPTY_ANCHOR_BYTES_REGEX.subn does.
+ *
+ * Build (optional, build.sh does this when a compiler is available):
+ *     cc -O3 -march=native -shared -fPIC $(python3-config --includes) \
+ *         _anchorclean.c -o _anchorclean$(python3-config --extension-suffix)
+ */
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <string.h>
+
+enum { ATTR_ID, ATTR_HREF };
+
+static int is_ws(unsigned char c) {
+  return c == ' ' || c == '\t' || c == '\n' || c == '\r' || c == '\f' || c == '\v';
+}
+
+static int is_quote(unsigned char c) {
+  return c == '\'' || c == '"';
+}
+
+static Py_ssize_t skip_ws(const unsigned char *buf, Py_ssize_t i, Py_ssize_t n) {
+  while (i < n && is_ws(buf[i]))
+    i++;
+  return i;
+}
+
+// Case-insensitive match of an ASCII keyword; returns the index after it or -1
+static Py_ssize_t match_keyword(const unsigned char *buf, Py_ssize_t i, Py_ssize_t n,
+                                const char *keyword) {
+  for (; *keyword; keyword++, i++) {
+    if (i >= n)
+      return -1;
+    unsigned char c = buf[i];
+    if (c >= 'A' && c <= 'Z')
+      c += 'a' - 'A';
+    if (c != (unsigned char) *keyword)
+      return -1;
+  }
+  return i;
+}
+
+// Parse id=... or href=#; sets *kind and returns the index after it or -1
+static Py_ssize_t match_attribute(const unsigned char *buf, Py_ssize_t i, Py_ssize_t n,
+                                  int *kind) {
+  Py_ssize_t j = match_keyword(buf, i, n, "id=");
+  if (j >= 0) {
+    *kind = ATTR_ID;
+    while (j < n && !is_ws(buf[j]) && buf[j] != '>')
+      j++;
+    return j;
+  }
+
+  j = match_keyword(buf, i, n, "href=");
+  if (j < 0)
+    return -1;
+  *kind = ATTR_HREF;
+  if (j < n && is_quote(buf[j]))
+    j++;
+  if (j >= n || buf[j] != '#')
+    return -1;
+  j++;
+  if (j < n && is_quote(buf[j]))
+    j++;
+  return j;
+}
+
+// Try to match an empty anchor starting at buf[start] == '<'; returns the end or -1
+static Py_ssize_t match_empty_anchor(const unsigned char *buf, Py_ssize_t start, Py_ssize_t n) {
+  Py_ssize_t i = match_keyword(buf, start, n, "<a");
+  if (i < 0)
+    return -1;
+
+  Py_ssize_t j = skip_ws(buf, i, n);
+  if (j == i)
+    return -1;
+
+  int first, second;
+  i = match_attribute(buf, j, n, &first);
+  if (i < 0)
+    return -1;
+
+  // Optional second attribute of the other kind, separated by whitespace
+  j = skip_ws(buf, i, n);
+  if (j > i && j < n && buf[j] != '>') {
+    i = match_attribute(buf, j, n, &second);
+    if (i < 0 || second == first)
+      return -1;
+    j = skip_ws(buf, i, n);
+  }
+
+  if (j >= n || buf[j] != '>')
+    return -1;
+
+  j = skip_ws(buf, j + 1, n);
+  return match_keyword(buf, j, n, "</a>");
+}
+
+static PyObject *anchorclean_clean(PyObject *self, PyObject *args) {
+  Py_buffer view;
+  if (!PyArg_ParseTuple(args, "y*", &view))
+    return NULL;
+
+  const unsigned char *buf = view.buf;
+  Py_ssize_t n = view.len;
+
+  // Output never grows, so a buffer of the input size is enough
+  unsigned char *out = PyMem_Malloc(n > 0 ? n : 1);
+  if (out == NULL) {
+    PyBuffer_Release(&view);
+    return PyErr_NoMemory();
+  }
+
+  Py_ssize_t position = 0, written = 0, count = 0;
+  Py_ssize_t i = 0;
+  while (i < n) {
+    const unsigned char *lt = memchr(buf + i, '<', n - i);
+    if (lt == NULL)
+      break;
+    Py_ssize_t start = lt - buf;
+    Py_ssize_t end = match_empty_anchor(buf, start, n);
+    if (end < 0) {
+      i = start + 1;
+      continue;
+    }
+    memcpy(out + written, buf + position, start - position);
+    written += start - position;
+    position = i = end;
+    count++;
+  }
+  memcpy(out + written, buf + position, n - position);
+  written += n - position;
+
+  PyBuffer_Release(&view);
+  PyObject *cleaned = PyBytes_FromStringAndSize((const char *) out, written);
+  PyMem_Free(out);
+  if (cleaned == NULL)
+    return NULL;
+  return Py_BuildValue("(Nn)", cleaned, count);
+}
+
+static PyMethodDef anchorclean_methods[] = {
+  {"clean", anchorclean_clean, METH_VARARGS,
+   "clean(data) -> (bytes, int)\n\n"
+   "Remove empty anchor tags from bytes-like UTF-8 HTML and return the cleaned\n"
+   "bytes together with the number of anchor tags removed."},
+  {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef anchorclean_module = {
+  PyModuleDef_HEAD_INIT, "_anchorclean",
+  "C fast path for removing empty anchor tags from HTML.", -1, anchorclean_methods
+};
+
+PyMODINIT_FUNC PyInit__anchorclean(void) {
+  return PyModule_Create(&anchorclean_module);
+}
@@ -73,10 +73,25 @@ else
   python3 "$PYTHON_SCRIPT"
 fi
 
+# Build the optional C fast paths for empty anchor removal and sanitization;
+# the Python regex path is used instead if no compiler is available or a
+# build fails
+SCRIPTS_DIR="$PROJECT_ROOT/.github/scripts"
+if command -v cc &> /dev/null && command -v python3-config &> /dev/null; then
+  for extension in _anchorclean _htmlsanitize; do
+    log_message "Building $extension C extension..."
+    cc -O3 -march=native -shared -fPIC $(python3-config --includes) \
+      "$SCRIPTS_DIR/$extension.c" \
+      -o "$SCRIPTS_DIR/$extension$(python3-config --extension-suffix)" \
+      || log_message "Could not build $extension, using the regex fallback"
+  done
+fi
+
 # Clean HTML files to remove empty anchor tags
 # Using fix_empty_anchors.py which is more targeted and preserves icons and other content
+# -OO skips loading the scripts' docstrings in the parent and every worker
 log_message "Cleaning HTML files to remove empty anchor tags..."
-python3 "$PROJECT_ROOT/.github/scripts/fix_empty_anchors.py" "$DOCS_DIR"
+python3 -OO "$PROJECT_ROOT/.github/scripts/fix_empty_anchors.py" "$DOCS_DIR"
 
 
 if [ $? -ne 0 ]; then
@@ -26,7 +26,7 @@ When to use which script:
       working with HTML that may contain script tags with anchors
 
 Dependencies:
-    - None - relies only on standard library (re, os, glob)
+    - None - relies only on standard library (re, os, mmap, hashlib)
     - Uses shared patterns from html_cleaning_patterns.py if available
 
 Usage:
@@ -34,52 +34,129 @@ Usage:
 """
 
 import sys
+import io
 import re
 import os
-import glob
+import stat
+import mmap
+import hashlib
 import argparse
+import contextlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 
 # Try to import shared patterns, fall back to local patterns if not available
 try:
-    from html_cleaning_patterns import EMPTY_ANCHOR_PATTERNS, apply_empty_anchor_cleanup
+    from html_cleaning_patterns import (
+        EMPTY_ANCHOR_PATTERNS, EMPTY_ANCHOR_REGEX, EMPTY_ANCHOR_BYTES_REGEX,
+        apply_empty_anchor_cleanup, remove_empty_anchors
+    )
     USES_SHARED_PATTERNS = True
 except ImportError:
     # If shared patterns aren't available, define patterns locally
     USES_SHARED_PATTERNS = False
     # Define patterns here for backwards compatibility
     EMPTY_ANCHOR_PATTERNS = [
+        # Written without capturing groups or nested repeats so a long run of
+        # whitespace cannot cause catastrophic backtracking. An id value is
+        # [^\s>]*, which already covers any quotes around it, and \s* covers
+        # newlines between the tags.
+
         # Combined pattern for id and href attributes in either order with optional newlines
-        r'(?i)<a\s+id=[\'"]?([^\s>]*)[\'"]?\s+href=[\'"]?#[\'"]?\s*>\s*(?:\n\s*)*</a>',
-        r'(?i)<a\s+href=[\'"]?#[\'"]?\s+id=[\'"]?([^\s>]*)[\'"]?\s*>\s*(?:\n\s*)*</a>',
+        r'(?i)<a\s+id=[^\s>]*\s+href=[\'"]?#[\'"]?\s*>\s*</a>',
+        r'(?i)<a\s+href=[\'"]?#[\'"]?\s+id=[^\s>]*\s*>\s*</a>',
         
         # Single pattern for id attribute only with optional newlines
-        r'(?i)<a\s+id=[\'"]?([^\s>]*)[\'"]?\s*>\s*(?:\n\s*)*</a>',
+        r'(?i)<a\s+id=[^\s>]*\s*>\s*</a>',
         
         # Single pattern for href='#' only with optional newlines
-        r'(?i)<a\s+href=[\'"]?#[\'"]?\s*>\s*(?:\n\s*)*</a>',
+        r'(?i)<a\s+href=[\'"]?#[\'"]?\s*>\s*</a>',
         
         # Combined pattern for unquoted attributes in either order
-        r'(?i)<a\s+(?:id=([^\s>]*)\s+href=#|href=#\s+id=([^\s>]*))\s*>\s*(?:\n\s*)*</a>'
+        r'(?i)<a\s+(?:id=[^\s>]*\s+href=#|href=#\s+id=[^\s>]*)\s*>\s*</a>'
     ]
+
+    # Fuse the patterns into one alternation compiled once at import, so each
+    # file is scanned in a single pass; the shared '<a' prefix is matched once
+    EMPTY_ANCHOR_PREFIX = r'(?i)<a\s+'
+    EMPTY_ANCHOR_REGEX = re.compile(
+        EMPTY_ANCHOR_PREFIX + '(?:' + '|'.join(
+            f"(?:{pattern.removeprefix(EMPTY_ANCHOR_PREFIX)})" for pattern in EMPTY_ANCHOR_PATTERNS
+        ) + ')'
+    )
+    # The patterns are pure ASCII, so they apply unchanged to raw UTF-8 bytes
+    EMPTY_ANCHOR_BYTES_REGEX = re.compile(EMPTY_ANCHOR_REGEX.pattern.encode('ascii'))
     
-    # Implement apply_empty_anchor_cleanup locally for consistency
+    # Implement remove_empty_anchors and apply_empty_anchor_cleanup locally
+    # for consistency
+    def remove_empty_anchors(content):
+        """
+        Remove empty anchor tags from the content and count the removals.
+        Local implementation for when the shared module is not available.
+        
+        Args:
+            content: HTML content to clean, as str or as UTF-8 bytes-like data
+            
+        Returns:
+            tuple: (cleaned content, number of anchor tags removed)
+        """
+        if isinstance(content, str):
+            return EMPTY_ANCHOR_REGEX.subn('', content)
+        return EMPTY_ANCHOR_BYTES_REGEX.subn(b'', content)
+
     def apply_empty_anchor_cleanup(content):
         """
         Apply all empty anchor cleanup patterns to the content.
         Local implementation for when the shared module is not available.
         
         Args:
-            content: HTML content to clean
+            content: HTML content to clean, as str or as UTF-8 bytes-like data
             
         Returns:
-            str: Cleaned HTML content with empty anchors removed
+            str or bytes: Cleaned HTML content with empty anchors removed
         """
-        result = content
-        for pattern in EMPTY_ANCHOR_PATTERNS:
-            result = re.sub(pattern, '', result)
-        return result
+        return remove_empty_anchors(content)[0]
+
+# Per-process memo of cleanup results keyed by a BLAKE2b digest of the file
+# content, so identical pages (redirect stubs, empty indexes) are only scanned
+# once per worker. Values are (cleaned bytes or None if unchanged, count).
+CLEANUP_CACHE = {}
+CLEANUP_CACHE_MAX_ENTRIES = 1024
+
+# Per-process read buffer for small files, filled with os.preadv where
+# available; files of this size or larger are mmap'd
+READ_BUFFER_SIZE = 256 * 1024
+READ_BUFFER = bytearray(READ_BUFFER_SIZE)
+USE_PREADV = hasattr(os, 'preadv')
+
+# Length in bytes of the shortest possible empty anchor, '<a id=></a>'
+MIN_EMPTY_ANCHOR_SIZE = 11
+
+def write_file_atomically(file_path, data, mode):
+    """
+    Replaces a file's content without ever leaving it half-written.
+
+    The data goes to a sibling temporary file that is then renamed over the
+    original, so an interrupted run leaves either the old or the new content.
+
+    Args:
+        file_path: Path of the file to replace
+        data: New file content as bytes
+        mode: Permission bits to give the new file
+    """
+    temp_path = f"{file_path}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
 
-def fix_html_file(file_path, verbose=False, dry_run=False):
+def fix_html_file(file_path, verbose=False, dry_run=False, file_stat=None):
     """
     Removes empty anchor tags from an HTML file using direct string replacement.
 
@@ -87,56 +164,148 @@ def fix_html_file(file_path, verbose=False, dry_run=False):
         file_path: Path to the HTML file to clean
         verbose: If True, prints detailed information
         dry_run: If True, shows changes without writing to file
+        file_stat: os.stat_result for the file if already known (e.g. from
+            the directory walk), saving a stat call
 
     Returns:
         int: Number of replacements made
+
+    Raises:
+        OSError: If the file cannot be read or written back
     """
+    if verbose:
+        print(f"Processing file: {file_path}")
+
+    # A file shorter than the shortest empty anchor cannot contain one, so
+    # it is not even opened. This also covers empty files, which mmap
+    # cannot map.
+    if file_stat is None:
+        file_stat = os.stat(file_path)
+    if file_stat.st_size < MIN_EMPTY_ANCHOR_SIZE:
+        if verbose:
+            print(f"  No empty anchors found in {file_path}")
+        return 0
+
+    # Work on the raw bytes instead of decoding: the anchors are pure ASCII,
+    # so a bytes regex finds the same tags without building a str copy of
+    # the whole file
+    fd = os.open(file_path, os.O_RDONLY)
     try:
-        # Read the file
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        # Small files are read with a single preadv into a buffer this
+        # process reuses, which saves the mmap/munmap calls and a per-file
+        # allocation; larger files (or one that grew to fill the buffer
+        # since the fstat) are mapped instead
+        source = None
+        if USE_PREADV and file_stat.st_size < READ_BUFFER_SIZE:
+            length = os.preadv(fd, [READ_BUFFER], 0)
+            if length < READ_BUFFER_SIZE:
+                source = READ_BUFFER
+        if source is None:
+            source = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+            length = len(source)
 
-        # Store original content length for comparison
-        initial_content_length = len(content)
+        try:
+            with memoryview(source) as view, view[:length] as content:
+                # Every empty anchor starts with "<a" (in either case); a
+                # plain substring search is far cheaper than a regex pass
+                # on files without one
+                if source.find(b'<a', 0, length) == -1 and source.find(b'<A', 0, length) == -1:
+                    if verbose:
+                        print(f"  No empty anchors found in {file_path}")
+                    return 0
 
+                # Reuse the result for content this process has already seen
+                digest = hashlib.blake2b(content, digest_size=16).digest()
+                cached = CLEANUP_CACHE.get(digest)
+                if cached is not None:
+                    modified_content, replacements = cached
+                else:
+                    # remove_empty_anchors is bound at import to the shared
+                    # implementation or the local fallback, and reports the
+                    # exact number of anchors removed
+                    modified_content, replacements = remove_empty_anchors(content)
+
+                    if len(CLEANUP_CACHE) < CLEANUP_CACHE_MAX_ENTRIES:
+                        CLEANUP_CACHE[digest] = (modified_content if replacements else None, replacements)
+        finally:
+            if source is not READ_BUFFER:
+                source.close()
+    finally:
+        os.close(fd)
+
+    # Only proceed if changes were made
+    if replacements > 0:
         if verbose:
-            print(f"Processing file: {file_path}")
-        
-        # Apply anchor cleanup using shared patterns if available,
-        # or fall back to local implementation
-        if USES_SHARED_PATTERNS and 'apply_empty_anchor_cleanup' in globals():
-            # Use the imported shared function
-            modified_content = apply_empty_anchor_cleanup(content)
+            print(f"  Found {replacements} empty anchor tags")
+
+        if dry_run:
+            print(f"[DRY RUN] Would fix {file_path}: {replacements} empty anchor tags")
         else:
-            # Apply all patterns directly
-            modified_content = content
-            for pattern in EMPTY_ANCHOR_PATTERNS:
-                modified_content = re.sub(pattern, '', modified_content)
-
-        # Calculate approximate number of replacements
-        final_content_length = len(modified_content)
-        chars_removed = initial_content_length - final_content_length
-        replacements = chars_removed // 20  # Approximate size of each anchor tag
-
-        # Only proceed if changes were made
-        if replacements > 0:
-            if verbose:
-                print(f"  Found approximately {replacements} empty anchor tags")
-
-            if dry_run:
-                print(f"[DRY RUN] Would fix {file_path}: {replacements} empty anchor tags")
-            else:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(modified_content)
-                print(f"Fixed {file_path}: removed approximately {replacements} empty anchor tags")
-        elif verbose:
-            print(f"  No empty anchors found in {file_path}")
-        
+            write_file_atomically(file_path, modified_content, stat.S_IMODE(file_stat.st_mode))
+            print(f"Fixed {file_path}: removed {replacements} empty anchor tags")
         return replacements
-        
+
+    if verbose:
+        print(f"  No empty anchors found in {file_path}")
+    return 0
+
+def fix_html_entry(entry, verbose=False, dry_run=False):
+    """
+    Runs fix_html_file on a (path, stat) pair yielded by iter_html_files.
+
+    The file's messages are captured rather than printed, so pool workers do
+    not contend for stdout; the parent writes them out in walk order. An
+    error is returned instead of raised, so one unreadable file does not
+    stop the run, and the parent reports all errors together at the end.
+
+    Args:
+        entry: Tuple of the file path and its os.stat_result (or None)
+        verbose: If True, prints detailed information
+        dry_run: If True, shows changes without writing to file
+
+    Returns:
+        tuple: (number of replacements made, captured output text, error
+            message or None)
+    """
+    file_path, file_stat = entry
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output):
+            replacements = fix_html_file(file_path, verbose=verbose, dry_run=dry_run, file_stat=file_stat)
     except Exception as e:
-        print(f"Error fixing {file_path}: {e}")
-        return 0
+        return 0, output.getvalue(), f"Error fixing {file_path}: {e}"
+    return replacements, output.getvalue(), None
+
+def iter_html_files(root):
+    """
+    Recursively yields the HTML files under a directory with their stat info.
+
+    Uses os.scandir so each entry's type comes from the directory listing
+    instead of a separate stat call, and yields files as they are found so
+    they can be processed while the walk is still running. Hidden files and
+    directories are skipped, as glob does. The entry's stat result is passed
+    along so the size and mode do not have to be looked up again.
+
+    Args:
+        root: Directory to search
+
+    Yields:
+        tuple: (path, os.stat_result) for each HTML file found; the stat
+            result is None if it could not be read
+    """
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.name.startswith('.'):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_html_files(entry.path)
+            elif entry.name.endswith('.html'):
+                try:
+                    file_stat = entry.stat()
+                except OSError:
+                    # Let fix_html_file report the problem when it opens the file
+                    file_stat = None
+                yield entry.path, file_stat
 
 def main():
     # Set up argument parser
@@ -171,29 +340,57 @@ def main():
 
     if os.path.isfile(path):
         # Fix a single file
-        fix_html_file(path, verbose=verbose, dry_run=dry_run)
+        try:
+            fix_html_file(path, verbose=verbose, dry_run=dry_run)
+        except Exception as e:
+            print(f"Error fixing {path}: {e}")
     elif os.path.isdir(path):
         # Fix all HTML files in the directory and subdirectories
         if verbose:
             print(f"Searching for HTML files in {path} and subdirectories...")
 
-        html_files = glob.glob(os.path.join(path, '**', '*.html'), recursive=True)
-        total_files = len(html_files)
-
-        if verbose:
-            print(f"Found {total_files} HTML files")
-
+        total_files = 0
         fixed_files = 0
         total_replacements = 0
+        errors = []
+
+        # Files are independent, so spread them over a process pool; each
+        # worker runs its own regex engine without contending for the GIL.
+        # The walker feeds the pool lazily, so workers start on the first
+        # files while the rest of the tree is still being listed.
+        # Flush first so forked workers don't inherit and re-emit buffered output.
+        # Fork where the platform supports it, so workers share the already
+        # compiled regexes (and C extension or Hyperscan database) with the
+        # parent instead of re-importing and recompiling them as spawn does.
+        sys.stdout.flush()
+        if 'fork' in multiprocessing.get_all_start_methods():
+            mp_context = multiprocessing.get_context('fork')
+        else:
+            mp_context = None
+        with ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=mp_context) as executor:
+            results = executor.map(
+                partial(fix_html_entry, verbose=verbose, dry_run=dry_run),
+                iter_html_files(path),
+                chunksize=8
+            )
+            for replacements, output, error in results:
+                if output:
+                    sys.stdout.write(output)
+                if error:
+                    errors.append(error)
+                total_files += 1
+                if replacements > 0:
+                    fixed_files += 1
+                    total_replacements += replacements
+
+        for error in errors:
+            print(error)
 
-        for file in html_files:
-            replacements = fix_html_file(file, verbose=verbose, dry_run=dry_run)
-            if replacements > 0:
-                fixed_files += 1
-                total_replacements += replacements
+        if verbose:
+            print(f"Found {total_files} HTML files")
 
         action = "Would fix" if dry_run else "Fixed"
-        print(f"\nSummary: {action} {fixed_files} out of {total_files} files, removing approximately {total_replacements} empty anchor tags")
+        print(f"\nSummary: {action} {fixed_files} out of {total_files} files, removing {total_replacements} empty anchor tags")
     else:
         print(f"Error: {path} is not a valid file or directory")
         sys.exit(1)
@@ -1,8 +1,16 @@
 #!/usr/bin/env python3
-import os, subprocess, re, shutil, argparse, html, json
+import os, sys, subprocess, re, shutil, argparse, html, json, io, contextlib, hashlib, tempfile, atexit, heapq
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Union
 
+# Optional: orjson parses whole JSON documents several times faster than json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Parse args
 parser = argparse.ArgumentParser(description='Generate docs from source files')
 parser.add_argument('--debug', action='store_true', help='Enable debug output')
@@ -11,6 +19,286 @@ args = parser.parse_args()
 DEBUG = args.debug
 FORCE_REBUILD = args.force_rebuild
 
+# Precompiled regex patterns, compiled once at import instead of on every call
+# SEO metadata extraction
+SEO_METADATA_PATTERN = re.compile(r'<!--SEO_METADATA:(.*?)-->')
+HTML_TAG_PATTERN = re.compile(r'<[^>]*>')
+FIRST_PARAGRAPH_PATTERN = re.compile(r'^\s*#\s*(.*?)\s*$\s*([a-zA-Z].*?)(?=^\s*#|\Z)',
+                                     re.MULTILINE | re.DOTALL)
+WHITESPACE_PATTERN = re.compile(r'\s+')
+# Kept as separate patterns: each starts with a literal, which re finds with
+# a fast substring search, while a fused alternation tries every position
+# and measures about twice as slow over the same C sources
+TECH_KEYWORD_PATTERNS = (
+    re.compile(r'function\s+([a-zA-Z_][a-zA-Z0-9_]*)'),
+    re.compile(r'class\s+([a-zA-Z_][a-zA-Z0-9_]*)'),
+    re.compile(r'def\s+([a-zA-Z_][a-zA-Z0-9_]*)'),
+    re.compile(r'#include\s+["<]([^">]+)[">]')
+)
+# Keywords kept per page, and the number of distinct candidates after which
+# the content scan stops
+SEO_KEYWORD_COUNT = 10
+SEO_KEYWORD_SCAN_LIMIT = 64
+
+# Jupyter notebook metadata
+NOTEBOOK_TITLE_PATTERN = re.compile(r'^#\s+(.+)$', re.MULTILINE)
+NOTEBOOK_DESCRIPTION_PATTERN = re.compile(r'^#\s+.+\n\n(.+?)(?=\n\n|\Z)', re.DOTALL | re.MULTILINE)
+NOTEBOOK_FEATURE_PATTERN = re.compile(r'^\s*[\*\-\+]\s+(.+)$', re.MULTILINE)
+META_UNSAFE_CHARS_PATTERN = re.compile(r'[^\w\s.,;:!?()-]')
+# Start of a notebook whose first key is "cells", as nbformat writes it, and
+# the separator after each cell
+NOTEBOOK_CELLS_START_PATTERN = re.compile(r'\s*\{\s*"cells"\s*:\s*\[\s*')
+NOTEBOOK_CELL_SEPARATOR_PATTERN = re.compile(r'\s*([,\]])\s*')
+NOTEBOOK_JSON_DECODER = json.JSONDecoder()
+
+# Python docstrings: a triple-quoted string that starts its own line and whose
+# closing quotes end a line
+PYTHON_DOCSTRING_PATTERN = re.compile(r'^[ \t]*[rRuU]?("""|\'\'\')(.*?)\1[ \t]*$', re.DOTALL | re.MULTILINE)
+
+# Translation tables that delete characters from descriptions in one C-level
+# pass; str.translate is several times faster than an re.sub character class
+# on the long first-paragraph descriptions taken from source files
+ATTRIBUTE_UNSAFE_CHARS_TABLE = str.maketrans('', '', '"\'\\<>')
+MARKDOWN_CHARS_TABLE = str.maketrans('', '', '#`*_')
+NOTEBOOK_UNSAFE_CHARS_TABLE = str.maketrans('', '', '"\'>')
+
+# Pandoc output fixups
+MALFORMED_DESC_META_PATTERN = re.compile(
+    r'<meta\s+name="description"\s+content="([^"]*(?:target|href|class|style|onclick)[^"]*)"[^>]*>'
+)
+# Code block wrappers, added around pandoc's <pre><code> and sourceCode divs.
+# The patterns define the matches; wrap_code_blocks and wrap_source_code_divs
+# find the same matches with str.find and use them only as a fallback.
+CODE_BLOCK_PATTERN = re.compile(r'<pre[^>]*><code[^>]*>.*?</code></pre>', re.DOTALL | re.IGNORECASE)
+SOURCE_CODE_DIV_PATTERN = re.compile(r'<div class="sourceCode" id="cb\d+"[^>]*>(.*?)</div>', re.DOTALL | re.IGNORECASE)
+CODE_BLOCK_CONTAINER_OPEN = '<div class="code-block-container">'
+# Characters that IGNORECASE matches against ASCII letters of those patterns
+# (dotted and dotless i, long s); U+0130 also changes length under lower()
+CASE_FOLD_SPECIAL_CHARS = ('İ', 'ı', 'ſ')
+# Links to source files that need the .html extension of their pages
+DOC_LINK_PATTERN = re.compile(r'(<a[^>]+href=")([^"]+)(">[^<]+</a>)')
+SOURCE_LINK_EXTENSION_PATTERN = re.compile(r'\.(c|h|py|sh|md)$')
+# Template scripts for dynamic asset paths, removed from generated pages in
+# one pass; the shared '<script' prefix keeps the alternation on re's fast
+# literal search, which beats checking for each script's marker separately
+DYNAMIC_PATH_SCRIPT_PATTERN = re.compile(
+    r'<script[^>]*>\s*(?:// Dynamic base path resolution|// Helper function to create dynamic asset paths|'
+    r'window\.basePath\s*=|function\s+assetPath).*?</script>', re.DOTALL)
+# C pages: trailing line numbers left by literate-c, and #include spans
+# The whitespace a bare number needs before it is checked with a lookbehind
+# rather than matched by its own \s+, so a run of whitespace has only one
+# way to split between numbers; with nested \s* quantifiers a failed match
+# backtracked through every split, exponential in the run's length
+TRAILING_LINE_NUMBER_PATTERN = re.compile(r'\s*(?:(?:<span class="[^"]*">\s*\d+\s*</span>|(?<=\s)\d+)\s*)+</span>')
+INCLUDE_SPAN_PATTERN = re.compile(
+    r'(<span class="pp">#include\s*</span>)(<span class=\"im\">)(?:\"|&quot;)(.*?)(?:\"|&quot;)(</span>)',
+    re.DOTALL
+)
+# C pages: the lines decl_anchors.awk anchors, a listing's opening "<pre>1"
+# and lines holding only a line number (group 1)
+DECL_ANCHOR_LINE_PATTERN = re.compile(r'<pre>1$|^ *([0-9]*)$', re.MULTILINE)
+
+# Pandoc input sanitization
+SELF_CLOSING_ANCHOR_PATTERN = re.compile(r'<a([^>]*)/>')
+EMPTY_ANCHOR_TAG_PATTERN = re.compile(r'<a\s+[^>]*>\s*</a>')
+HTML_CODE_FENCE_PATTERN = re.compile(r'```html(.*?)```', re.DOTALL)
+
+# README: first H1 heading (the wiki title) and the directory tree block
+README_H1_PATTERN = re.compile(r'^# (.+)$', re.MULTILINE)
+README_TREE_PATTERN = re.compile(r'```\s*\n(├.*?\n.*?└.*?)\n```', re.DOTALL)
+# Box-drawing characters and spaces that make up a tree line's prefix
+TREE_PREFIX_CHARS = ' │├└─'
+
+# Directory index pages: page descriptions (matched on the raw UTF-8 bytes,
+# so only the description itself is decoded), and the template blocks and
+# variables filled in or removed without pandoc
+META_DESCRIPTION_PATTERN = re.compile(rb'<meta\s+name="description"\s+content="([^"]+)"')
+TEMPLATE_TABS_BLOCK_PATTERN = re.compile(r'\$if\(tabs\)\$(.*?)\$tabs\$(.*?)\$endif\$', re.DOTALL)
+TEMPLATE_BODY_PATTERN = re.compile(r'<div class="page-content">\s*.*?\$body\$.*?</div>', re.DOTALL)
+TEMPLATE_VARIABLE_PATTERN = re.compile(r'\$[a-zA-Z0-9_]+\$')
+TEMPLATE_IF_BLOCK_PATTERN = re.compile(r'\$if\([^)]+\)\$.*?\$endif\$', re.DOTALL)
+# Literal template placeholders a directory index fills in, by variable,
+# all replaced in a single pass over the template
+DIRECTORY_INDEX_PLACEHOLDERS = {
+    'pagetitle': "$if(pagetitle)$$pagetitle$$endif$$if(wikititle)$ | $wikititle$$endif$",
+    'description': "$if(description)$$description$$else$Computational fluid dynamics simulations using Basilisk C framework.$endif$",
+    'keywords': "$if(keywords)$$keywords$$else$fluid dynamics, CFD, Basilisk, multiphase flow, computational physics$endif$",
+    'reponame': "$if(reponame)$$reponame$$else$Documentation$endif$",
+    'asset_path_prefix': "$asset_path_prefix$",
+}
+DIRECTORY_INDEX_PLACEHOLDER_PATTERN = re.compile('|'.join(map(re.escape, DIRECTORY_INDEX_PLACEHOLDERS.values())))
+# Icon class for each source extension in a directory index; anything
+# else gets "file-other"
+FILE_TYPE_CLASSES = {
+    '.c': "file-c",
+    '.h': "file-c",
+    '.py': "file-python",
+    '.ipynb': "file-jupyter",
+}
+# Directory index titles that differ from the capitalized directory name,
+# by capitalized name
+DIRECTORY_TITLES = {
+    'Src-local': "Local Source Files",
+    'Simulationcases': "Simulation Cases",
+    'Postprocess': "Post-Processing Tools",
+}
+
+# Minimal page wrapped around output that lacks its HTML skeleton, filled
+# with any extra <head> lines and the body by a single % format
+FALLBACK_HTML_TEMPLATE = (
+    '<!DOCTYPE html>\n'
+    '<html xmlns="http://www.w3.org/1999/xhtml">\n'
+    '<head>\n'
+    '    <meta http-equiv="Content-Type" content="text/html; charset=UTF-8" />\n'
+    '%s'
+    '</head>\n'
+    '<body>\n'
+    '%s\n'
+    '</body>\n'
+    '</html>'
+)
+
+# Sitemap entry for a page, by whether it gets the higher priority (index
+# pages and src-local); filled with the domain and page path by a single % format
+SITEMAP_URL_TEMPLATES = {
+    priority_high: (
+        '  <url>\n'
+        '    <loc>%s/%s</loc>\n'
+        '    <changefreq>monthly</changefreq>\n'
+        f'    <priority>{"0.8" if priority_high else "0.6"}</priority>\n'
+        '  </url>\n'
+    )
+    for priority_high in (True, False)
+}
+
+
+def load_json(data: Union[str, bytes]) -> Any:
+    """
+    Parses a JSON document, using orjson when it is installed.
+    
+    Falls back to the json module if orjson is unavailable or rejects input that json accepts, such as NaN values.
+    
+    Raises:
+        json.JSONDecodeError: If the document is not valid JSON.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+def remove_dynamic_path_scripts(html_content: str) -> str:
+    """
+    Removes the dynamic asset path scripts from generated HTML.
+    
+    Pages without a '<script' tag, which every match starts with, are returned without running the DOTALL pattern.
+    """
+    if '<script' not in html_content:
+        return html_content
+    return DYNAMIC_PATH_SCRIPT_PATTERN.sub('', html_content)
+
+def lowercase_for_search(html_content: str) -> Optional[str]:
+    """
+    Returns a lowercased copy of the HTML in which str.find gives the same positions as a case-insensitive regex, or None if the page contains characters for which that does not hold.
+    """
+    if any(char in html_content for char in CASE_FOLD_SPECIAL_CHARS):
+        return None
+    return html_content.lower()
+
+def wrap_code_blocks(html_content: str) -> str:
+    """
+    Wraps each <pre><code> block in a code-block-container div.
+    
+    Produces the same result as substituting CODE_BLOCK_PATTERN, but walks the page with str.find instead of a case-insensitive DOTALL regex, which is attempted at every position of the page.
+    """
+    lowered = lowercase_for_search(html_content)
+    if lowered is None:
+        return CODE_BLOCK_PATTERN.sub(lambda m: f'{CODE_BLOCK_CONTAINER_OPEN}{m.group(0)}</div>', html_content)
+    
+    parts = []
+    position = 0
+    start = lowered.find('<pre')
+    while start != -1:
+        pre_end = lowered.find('>', start)
+        if pre_end == -1:
+            break
+        if lowered.startswith('<code', pre_end + 1):
+            code_end = lowered.find('>', pre_end + 1)
+            if code_end == -1:
+                break
+            close = lowered.find('</code></pre>', code_end + 1)
+            if close == -1:
+                break
+            end = close + len('</code></pre>')
+            parts += (html_content[position:start], CODE_BLOCK_CONTAINER_OPEN, html_content[start:end], '</div>')
+            position = end
+            start = lowered.find('<pre', end)
+        else:
+            start = lowered.find('<pre', start + 1)
+    
+    if not parts:
+        return html_content
+    parts.append(html_content[position:])
+    return ''.join(parts)
+
+def wrap_source_code_divs(html_content: str) -> str:
+    """
+    Replaces each pandoc sourceCode div with a code-block-container div around its content.
+    
+    Produces the same result as substituting SOURCE_CODE_DIV_PATTERN, including ending the div at the first </div>, but walks the page with str.find.
+    """
+    lowered = lowercase_for_search(html_content)
+    if lowered is None:
+        return SOURCE_CODE_DIV_PATTERN.sub(lambda m: f'{CODE_BLOCK_CONTAINER_OPEN}{m.group(1)}</div>', html_content)
+    
+    opening = '<div class="sourcecode" id="cb'
+    parts = []
+    position = 0
+    start = lowered.find(opening)
+    while start != -1:
+        digits_end = start + len(opening)
+        while digits_end < len(lowered) and lowered[digits_end].isdecimal():
+            digits_end += 1
+        if digits_end > start + len(opening) and lowered.startswith('"', digits_end):
+            tag_end = lowered.find('>', digits_end)
+            if tag_end == -1:
+                break
+            close = lowered.find('</div>', tag_end + 1)
+            if close == -1:
+                break
+            parts += (html_content[position:start], CODE_BLOCK_CONTAINER_OPEN, html_content[tag_end + 1:close], '</div>')
+            position = close + len('</div>')
+            start = lowered.find(opening, position)
+        else:
+            start = lowered.find(opening, start + 1)
+    
+    if not parts:
+        return html_content
+    parts.append(html_content[position:])
+    return ''.join(parts)
+
+def insert_after_body_tag(html_content: str, snippet: str) -> str:
+    """
+    Inserts snippet right after each opening <body ...> tag.
+    
+    Produces the same result as substituting r'<body[^>]*>' with the tag plus snippet, but a page has a single body tag, so str.find locates it without a regex pass and a per-match callback.
+    """
+    parts = []
+    position = 0
+    start = html_content.find('<body')
+    while start != -1:
+        tag_end = html_content.find('>', start)
+        if tag_end == -1:
+            break
+        parts += (html_content[position:tag_end + 1], snippet)
+        position = tag_end + 1
+        start = html_content.find('<body', position)
+    if not parts:
+        return html_content
+    parts.append(html_content[position:])
+    return ''.join(parts)
+
 def debug_print(msg):
     """
     Prints a debug message if debug mode is enabled.
@@ -20,10 +308,19 @@ def debug_print(msg):
     """
     if DEBUG: print(msg)
 
+@lru_cache(maxsize=None)
+def asset_prefix_for_depth(depth: int) -> str:
+    """
+    Returns the relative asset path prefix for a page nested depth directories below the docs root.
+    """
+    return "." if depth <= 0 else "/".join([".."] * depth)
+
 def calculate_asset_prefix(output_path: Path, docs_dir: Path) -> str:
     """
     Returns the relative path prefix to reference assets from an HTML file based on its location within the documentation directory.
     
+    The depth is counted from the path separators after the docs root, so no intermediate Path objects are built, and the prefix for each depth is built only once.
+    
     Args:
         output_path: The path to the generated HTML file.
         docs_dir: The root directory of the documentation output.
@@ -31,13 +328,11 @@ def calculate_asset_prefix(output_path: Path, docs_dir: Path) -> str:
     Returns:
         A string representing the relative path prefix (e.g., ".", "..", "../..") to use for asset references.
     """
-    try:
-        if output_path.name == "index.html" and output_path.parent == docs_dir:
-            return "."
-        depth = len(output_path.relative_to(docs_dir).parents) - 1
-        return "." if depth <= 0 else "/".join([".."] * depth)
-    except ValueError:
+    docs_root = str(docs_dir) + os.sep
+    path_str = str(output_path)
+    if not path_str.startswith(docs_root):
         return "."
+    return asset_prefix_for_depth(path_str.count(os.sep, len(docs_root)))
 
 def extract_seo_metadata(file_path: Path, content: str) -> Dict[str, str]:
     """
@@ -55,32 +350,33 @@ def extract_seo_metadata(file_path: Path, content: str) -> Dict[str, str]:
     metadata = {}
     
     # Check for embedded SEO metadata (used by Jupyter notebooks)
-    seo_match = re.search(r'<!--SEO_METADATA:(.*?)-->', content)
+    seo_match = SEO_METADATA_PATTERN.search(content)
     if seo_match:
         try:
             debug_print(f"Found embedded SEO metadata in {file_path}")
-            embedded_metadata = json.loads(seo_match.group(1))
+            embedded_metadata = load_json(seo_match.group(1))
             if isinstance(embedded_metadata, dict):
                 metadata.update(embedded_metadata)
                 # Extra sanitization of description to be absolutely safe
                 if "description" in metadata:
-                    metadata["description"] = re.sub(r'<[^>]*>', '', metadata["description"])
-                    metadata["description"] = re.sub(r'["\'\\\<>]', '', metadata["description"])
+                    description = metadata["description"]
+                    if '<' in description:
+                        description = HTML_TAG_PATTERN.sub('', description)
+                    metadata["description"] = description.translate(ATTRIBUTE_UNSAFE_CHARS_TABLE)
                 return metadata
         except Exception as e:
             debug_print(f"Error parsing embedded SEO metadata: {e}")
     
     # Extract first paragraph as description (fallback for non-notebook files)
-    desc_match = re.search(r'^\s*#\s*(.*?)\s*$\s*([a-zA-Z].*?)(?=^\s*#|\Z)',
-                          content, re.MULTILINE | re.DOTALL)
+    desc_match = FIRST_PARAGRAPH_PATTERN.search(content)
     if desc_match:
         description = desc_match.group(2).strip()
         if not description or description.startswith(('```', '`', '#', '//')):
             description = desc_match.group(1).strip()
 
         # Clean up description and truncate to ~160 chars
-        description = re.sub(r'[#`*_]', '', description)
-        description = re.sub(r'\s+', ' ', description).strip()
+        description = description.translate(MARKDOWN_CHARS_TABLE)
+        description = WHITESPACE_PATTERN.sub(' ', description).strip()
         if len(description) > 160:
             description = description[:157] + "..."
         metadata["description"] = description
@@ -91,21 +387,21 @@ def extract_seo_metadata(file_path: Path, content: str) -> Dict[str, str]:
     name_parts = file_path.stem.replace('_', ' ').replace('-', ' ').split()
     keywords.update([p.lower() for p in name_parts if len(p) > 3])
 
-    # Add common technical terms if found in content
-    tech_patterns = [
-        r'function\s+([a-zA-Z_][a-zA-Z0-9_]*)',
-        r'class\s+([a-zA-Z_][a-zA-Z0-9_]*)',
-        r'def\s+([a-zA-Z_][a-zA-Z0-9_]*)',
-        r'#include\s+["<]([^">]+)[">]'
-    ]
-    for pattern in tech_patterns:
-        for match in re.finditer(pattern, content):
+    # Add common technical terms if found in content, stopping once there
+    # are plenty of candidates to choose from
+    for pattern in TECH_KEYWORD_PATTERNS:
+        if len(keywords) >= SEO_KEYWORD_SCAN_LIMIT:
+            break
+        for match in pattern.finditer(content):
             if match.group(1) and len(match.group(1)) > 3:
                 keywords.add(match.group(1).lower())
+                if len(keywords) >= SEO_KEYWORD_SCAN_LIMIT:
+                    break
 
-    # Format keywords as comma-separated string
+    # Format keywords as comma-separated string; nsmallest picks the first
+    # keywords alphabetically without sorting the whole set
     if keywords:
-        metadata["keywords"] = ", ".join(sorted(list(keywords)[:10]))
+        metadata["keywords"] = ", ".join(heapq.nsmallest(SEO_KEYWORD_COUNT, keywords))
     else:
         # Add default keywords if none were found
         metadata["keywords"] = "fluid dynamics, CFD, Basilisk, computational physics"
@@ -119,8 +415,9 @@ def extract_seo_metadata(file_path: Path, content: str) -> Dict[str, str]:
     # Ensure description is safe for HTML attributes
     if "description" in metadata:
         # Remove HTML tags and replace quotes
-        metadata["description"] = re.sub(r'<[^>]*>', '', metadata["description"])
-        metadata["description"] = re.sub(r'"', '\'', metadata["description"])
+        if '<' in metadata["description"]:
+            metadata["description"] = HTML_TAG_PATTERN.sub('', metadata["description"])
+        metadata["description"] = metadata["description"].replace('"', '\'')
 
         # Truncate if still too long
         if len(metadata["description"]) > 160:
@@ -135,15 +432,23 @@ def extract_seo_metadata(file_path: Path, content: str) -> Dict[str, str]:
 # Configuration
 REPO_ROOT = Path(__file__).parent.parent.parent
 SOURCE_DIRS = ['src-local', 'simulationCases', 'postProcess']
+# File extensions and exact file names converted to documentation pages
+SOURCE_FILE_EXTENSIONS = frozenset({'.c', '.h', '.py', '.sh', '.ipynb'})
+SOURCE_FILE_NAMES = frozenset({'Makefile'})
 DOCS_DIR = REPO_ROOT / 'docs'
 README_PATH = REPO_ROOT / 'README.md'
 INDEX_PATH = DOCS_DIR / 'index.html'
 BASILISK_DIR = REPO_ROOT / 'basilisk'
 DARCSIT_DIR = BASILISK_DIR / 'src' / 'darcsit'
 TEMPLATE_PATH = REPO_ROOT / '.github' / 'assets' / 'custom_template.html'
+# Template with asset paths fixed up, set by validate_config
+PROCESSED_TEMPLATE = ""
 LITERATE_C_SCRIPT = DARCSIT_DIR / 'literate-c'
 BASE_URL = "/"
 CSS_PATH = REPO_ROOT / '.github' / 'assets' / 'css' / 'custom_styles.css'
+# Content hashes of the sources the existing pages were built from, kept
+# outside docs/ so the cache is neither committed with nor deployed with the site
+BUILD_CACHE_PATH = REPO_ROOT / '.github' / '.docs_cache.json'
 
 # Get repository name from directory
 REPO_NAME = REPO_ROOT.name
@@ -156,6 +461,16 @@ except Exception as e:
     print(f"Warning: Could not read CNAME file: {e}")
     BASE_DOMAIN = "https://test.comphy-lab.org"
 
+@lru_cache(maxsize=None)
+def read_source_text(file_path: Path) -> str:
+    """
+    Reads a UTF-8 text file that does not change during a run, such as README.md.
+    
+    The content is cached, so later calls for the same path do not touch the disk again.
+    """
+    return file_path.read_text(encoding='utf-8')
+
+@lru_cache(maxsize=None)
 def extract_h1_from_readme(readme_path: Path) -> str:
     """
     Extracts the first H1 markdown header from a README file.
@@ -163,13 +478,12 @@ def extract_h1_from_readme(readme_path: Path) -> str:
     If no H1 header is found or the file cannot be read, returns "Documentation".
     """
     try:
-        with open(readme_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            h1_match = re.search(r'^# (.+)$', content, re.MULTILINE)
-            if h1_match:
-                return h1_match.group(1).strip()
-            debug_print("Warning: No h1 heading found in README.md")
-            return "Documentation"
+        content = read_source_text(readme_path)
+        h1_match = README_H1_PATTERN.search(content)
+        if h1_match:
+            return h1_match.group(1).strip()
+        debug_print("Warning: No h1 heading found in README.md")
+        return "Documentation"
     except Exception as e:
         print(f"Error reading README.md: {e}")
         return "Documentation"
@@ -177,6 +491,7 @@ def extract_h1_from_readme(readme_path: Path) -> str:
 # Dynamically get the wiki title from README.md
 WIKI_TITLE = extract_h1_from_readme(README_PATH)
 
+@lru_cache(maxsize=None)
 def process_template_for_assets(template_path: Path) -> str:
     """
     Reads and returns the content of the HTML template file for asset path processing.
@@ -188,8 +503,7 @@ def process_template_for_assets(template_path: Path) -> str:
         The content of the template file as a string, or an empty string if an error occurs.
     """
     try:
-        with open(template_path, 'r', encoding='utf-8') as f:
-            template_content = f.read()
+        template_content = template_path.read_text(encoding='utf-8')
         print(f"Repository name: {REPO_NAME}")
         debug_print("Template processed for correct asset paths")
         return template_content
@@ -201,12 +515,12 @@ def validate_config() -> bool:
     """
     Validates the existence of essential directories and files required for documentation generation.
     
-    Checks for the presence of core directories and files, processes the HTML template for Pandoc, and creates a temporary template file for use during conversion. Updates the global template path if successful.
+    Checks for the presence of core directories and files and processes the HTML template once, keeping it in memory. Pandoc needs a file path for the template, so a single temporary copy is written for all conversions and removed at exit. Updates the global template path if successful.
     
     Returns:
         True if all required paths exist and the template is processed successfully; False otherwise.
     """
-    global TEMPLATE_PATH
+    global TEMPLATE_PATH, PROCESSED_TEMPLATE
     
     essential_paths = [
         (BASILISK_DIR, "BASILISK_DIR"),
@@ -224,29 +538,93 @@ def validate_config() -> bool:
     if not processed_template:
         return False
         
-    temp_template_path = TEMPLATE_PATH.with_suffix('.temp.html')
-    
-    if temp_template_path.exists():
-        try:
-            temp_template_path.unlink()
-        except Exception as e:
-            print(f"Warning: Could not delete existing temporary template: {e}")
-    
     try:
-        with open(temp_template_path, 'w', encoding='utf-8') as f:
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', prefix='custom_template.',
+                                         suffix='.html', delete=False) as f:
             f.write(processed_template)
-        TEMPLATE_PATH = temp_template_path
+        TEMPLATE_PATH = Path(f.name)
+        atexit.register(remove_temp_template, TEMPLATE_PATH)
     except Exception as e:
         print(f"Error creating temporary template file: {e}")
         return False
     
+    PROCESSED_TEMPLATE = processed_template
     return True
 
+def remove_temp_template(temp_template_path: Path) -> None:
+    """
+    Deletes the temporary template file written by validate_config.
+    """
+    try:
+        temp_template_path.unlink()
+        debug_print(f"Cleaned up temporary template file")
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"Warning: Could not delete temporary template file: {e}")
+
+def hash_file(file_path: Path) -> str:
+    """
+    Returns the SHA-1 hex digest of a file's content.
+    """
+    return hashlib.sha1(file_path.read_bytes()).hexdigest()
+
+def source_cache_entry(file_path: Path, cached: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Returns the build cache entry for a source file: its content hash and the size and modification time it was hashed at.
+    
+    If the cached entry was recorded for the file's current size and modification time, it is returned as is instead of hashing the file again.
+    """
+    stat = file_path.stat()
+    if (isinstance(cached, dict) and 'sha1' in cached and
+            cached.get('mtime_ns') == stat.st_mtime_ns and cached.get('size') == stat.st_size):
+        return cached
+    return {'sha1': hash_file(file_path), 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+def load_build_cache(cache_path: Path) -> Dict[str, Dict[str, Any]]:
+    """
+    Loads the build cache mapping source paths (relative to the repo root) to the entries, from source_cache_entry, of the content their pages were built from.
+    
+    Returns:
+        The cache dictionary, or an empty dictionary if the cache is missing or unreadable.
+    """
+    try:
+        cache = load_json(cache_path.read_bytes())
+        return cache if isinstance(cache, dict) else {}
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"Warning: Could not read build cache {cache_path}: {e}")
+        return {}
+
+def save_build_cache(cache_path: Path, cache: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Writes the build cache mapping source paths to their cache entries.
+    """
+    try:
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, indent=2, sort_keys=True)
+    except Exception as e:
+        print(f"Warning: Could not write build cache {cache_path}: {e}")
+
+def iter_files(root: str):
+    """
+    Recursively yields os.DirEntry objects for the files under a directory.
+    
+    Uses os.scandir so file and directory types come from the directory listing instead of a stat call per entry. Like Path.rglob, symlinked directories are not descended into while symlinked files are included.
+    """
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_files(entry.path)
+            elif entry.is_file():
+                yield entry
+
 def find_source_files(root_dir: Path, source_dirs: List[str]) -> List[Path]:
     """
     Finds all supported source files in the specified directories and root directory.
     
-    Searches recursively within each source directory and non-recursively in the root directory for files with supported extensions (.c, .h, .py, .sh, .ipynb) or named 'Makefile', excluding files ending with '.dat'.
+    Searches recursively within each source directory and non-recursively in the root directory for files with supported extensions (.c, .h, .py, .sh, .ipynb) or named 'Makefile'.
     
     Args:
         root_dir: The root directory to search for source files.
@@ -255,27 +633,25 @@ def find_source_files(root_dir: Path, source_dirs: List[str]) -> List[Path]:
     Returns:
         A sorted list of Paths to the discovered source files.
     """
-    valid_exts = {'.c', '.h', '.py', '.sh', '.ipynb'}
-    valid_names = {'Makefile'}
     files = set()
 
+    def is_source_file(name: str) -> bool:
+        # Checked on the bare name so Paths are only built for matches; a
+        # '.dat' file never has one of the extensions, so no separate test
+        return name in SOURCE_FILE_NAMES or os.path.splitext(name)[1] in SOURCE_FILE_EXTENSIONS
+
     for dir_name in source_dirs:
         src_path = root_dir / dir_name
         if src_path.is_dir():
-            for f in src_path.rglob('*'):
-                if f.is_file():
-                    if f.name in valid_names:
-                        files.add(f)
-                    elif f.suffix in valid_exts and not f.name.endswith('.dat'):
-                        files.add(f)
+            for entry in iter_files(src_path):
+                if is_source_file(entry.name):
+                    files.add(Path(entry.path))
 
     # Search for .sh files and Makefiles in root directory
-    for f in root_dir.iterdir():
-        if f.is_file():
-            if f.name in valid_names:
-                files.add(f)
-            elif f.suffix in valid_exts and not f.name.endswith('.dat'):
-                files.add(f)
+    with os.scandir(root_dir) as entries:
+        for entry in entries:
+            if entry.is_file() and is_source_file(entry.name):
+                files.add(Path(entry.path))
 
     return sorted(files)
 
@@ -283,8 +659,7 @@ def process_markdown_file(file_path: Path) -> str:
     """
     Reads and returns the content of a Markdown file for further processing or conversion.
     """
-    with open(file_path, 'r', encoding='utf-8') as f:
-        return f.read()
+    return file_path.read_text(encoding='utf-8')
 
 def process_shell_file(file_path: Path) -> str:
     """
@@ -292,14 +667,44 @@ def process_shell_file(file_path: Path) -> str:
     
     The script content is escaped to prevent Pandoc from interpreting shell variables or boolean assignments.
     """
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-        # Escape any potential variables that could conflict with Pandoc
-        content = content.replace("$", "\\$")
-        # Escape variable assignments with true/false values
-        content = content.replace("=true", "=\\true")
-        content = content.replace("=false", "=\\false")
-        return f"# {file_path.name}\n\n```bash\n{content}\n```"
+    content = file_path.read_text(encoding='utf-8')
+    
+    # Three str.replace calls measure well over ten times faster here than
+    # str.translate or a single regex pass: each is a C-level search that
+    # returns the string unchanged when there is nothing to replace
+    # Escape any potential variables that could conflict with Pandoc
+    content = content.replace("$", "\\$")
+    # Escape variable assignments with true/false values
+    content = content.replace("=true", "=\\true")
+    content = content.replace("=false", "=\\false")
+    return f"# {file_path.name}\n\n```bash\n{content}\n```"
+
+def iter_notebook_cells(notebook_content: str):
+    """
+    Yields the cells of a Jupyter notebook, decoding each one only when it is reached.
+    
+    When the notebook starts with the "cells" key, as nbformat writes it, the cell list is walked with JSONDecoder.raw_decode, so a caller that stops early never decodes the (often large) outputs of the remaining cells. Other layouts are decoded in full.
+    
+    Raises:
+        json.JSONDecodeError: If the notebook is not valid JSON up to the cells consumed.
+    """
+    start = NOTEBOOK_CELLS_START_PATTERN.match(notebook_content)
+    if not start:
+        yield from load_json(notebook_content).get('cells', [])
+        return
+    
+    position = start.end()
+    if notebook_content.startswith(']', position):
+        return
+    while True:
+        cell, position = NOTEBOOK_JSON_DECODER.raw_decode(notebook_content, position)
+        yield cell
+        separator = NOTEBOOK_CELL_SEPARATOR_PATTERN.match(notebook_content, position)
+        if not separator:
+            raise json.JSONDecodeError("Expecting ',' delimiter", notebook_content, position)
+        if separator.group(1) == ']':
+            return
+        position = separator.end()
 
 def process_jupyter_notebook(file_path: Path) -> str:
     """
@@ -315,8 +720,7 @@ def process_jupyter_notebook(file_path: Path) -> str:
     """
     notebook_filename = file_path.name
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            notebook_content = f.read()
+        notebook_content = file_path.read_text(encoding='utf-8')
         
         rel_path = file_path.relative_to(REPO_ROOT).parent
         notebook_path = notebook_filename if rel_path.as_posix() == '.' else f"{rel_path}/{notebook_filename}"
@@ -326,17 +730,17 @@ def process_jupyter_notebook(file_path: Path) -> str:
         notebook_features = []
         
         try:
-            notebook_data = json.loads(notebook_content)
-            for cell in notebook_data.get('cells', []):
+            # Cells are decoded lazily; the loop usually stops at the first one
+            for cell in iter_notebook_cells(notebook_content):
                 if cell.get('cell_type') == 'markdown':
                     source = ''.join(cell.get('source', []))
-                    title_match = re.search(r'^#\s+(.+)$', source, re.MULTILINE)
+                    title_match = NOTEBOOK_TITLE_PATTERN.search(source)
                     if title_match:
                         notebook_title = title_match.group(1).strip()
-                        desc_match = re.search(r'^#\s+.+\n\n(.+?)(?=\n\n|\Z)', source, re.DOTALL | re.MULTILINE)
+                        desc_match = NOTEBOOK_DESCRIPTION_PATTERN.search(source)
                         if desc_match:
                             notebook_description = desc_match.group(1).strip()
-                            features_match = re.findall(r'^\s*[\*\-\+]\s+(.+)$', source, re.MULTILINE)
+                            features_match = NOTEBOOK_FEATURE_PATTERN.findall(source)
                             if features_match:
                                 notebook_features = [f.strip() for f in features_match[:3]]
                         break
@@ -357,13 +761,14 @@ def process_jupyter_notebook(file_path: Path) -> str:
         # This is critical to prevent meta tag corruption
         
         # Step 1: Remove all HTML tags from the description
-        notebook_description = re.sub(r'<[^>]*>', '', notebook_description)
+        if '<' in notebook_description:
+            notebook_description = HTML_TAG_PATTERN.sub('', notebook_description)
         
         # Step 2: Remove any potential content that might break attributes
-        notebook_description = re.sub(r'["\'>]', '', notebook_description)
+        notebook_description = notebook_description.translate(NOTEBOOK_UNSAFE_CHARS_TABLE)
         
         # Step 3: Create a highly sanitized version for use in meta tags
-        meta_safe_description = re.sub(r'[^\w\s.,;:!?()-]', '', notebook_description)
+        meta_safe_description = META_UNSAFE_CHARS_PATTERN.sub('', notebook_description)
         meta_safe_description = meta_safe_description.strip()
         if len(meta_safe_description) > 160:
             meta_safe_description = meta_safe_description[:157] + "..."
@@ -381,6 +786,10 @@ def process_jupyter_notebook(file_path: Path) -> str:
             "meta_tags": f'<meta name="description" content="{meta_safe_description}">\n'
         }
         
+        # Element id suffix and GitHub path, each used several times below
+        notebook_id = notebook_filename.replace('.', '-')
+        notebook_repo_path = f"comphy-lab/{REPO_NAME}/blob/main/{notebook_path}"
+        
         embed_html = f"""# {safe_notebook_title}
 
 ```{{=html}}
@@ -391,11 +800,11 @@ def process_jupyter_notebook(file_path: Path) -> str:
         <a href="{notebook_filename}" download class="notebook-btn download-btn">
             <i class="fa-solid fa-download"></i> Download Notebook
         </a>
-        <a href="https://nbviewer.org/github/comphy-lab/{REPO_NAME}/blob/main/{notebook_path}" 
+        <a href="https://nbviewer.org/github/{notebook_repo_path}" 
            target="_blank" class="notebook-btn view-btn">
             <i class="fa-solid fa-eye"></i> View in nbviewer
         </a>
-        <a href="https://colab.research.google.com/github/comphy-lab/{REPO_NAME}/blob/main/{notebook_path}" 
+        <a href="https://colab.research.google.com/github/{notebook_repo_path}" 
            target="_blank" class="notebook-btn colab-btn">
             <i class="fa-solid fa-play"></i> Open in Colab
         </a>
@@ -418,13 +827,13 @@ def process_jupyter_notebook(file_path: Path) -> str:
     <!-- Embedded Jupyter Notebook -->
     <div class="embedded-notebook">
         <h3>Notebook Preview</h3>
-        <div id="notebook-container-{notebook_filename.replace('.', '-')}" >
-            <iframe id="notebook-iframe-{notebook_filename.replace('.', '-')}" 
-                    src="https://nbviewer.org/github/comphy-lab/{REPO_NAME}/blob/main/{notebook_path}" 
+        <div id="notebook-container-{notebook_id}" >
+            <iframe id="notebook-iframe-{notebook_id}" 
+                    src="https://nbviewer.org/github/{notebook_repo_path}" 
                     width="100%" height="800px" frameborder="0"
-                    onload="checkIframeLoaded('{notebook_filename.replace('.', '-')}')"
-                    onerror="handleIframeError('{notebook_filename.replace('.', '-')}')"></iframe>
-            <div id="notebook-error-{notebook_filename.replace('.', '-')}" 
+                    onload="checkIframeLoaded('{notebook_id}')"
+                    onerror="handleIframeError('{notebook_id}')"></iframe>
+            <div id="notebook-error-{notebook_id}" 
                  class="notebook-error-message" style="display: none;">
                 <div class="error-container">
                     <i class="fa-solid fa-exclamation-triangle"></i>
@@ -496,67 +905,48 @@ def process_python_file(file_path: Path) -> str:
     Returns:
         A Markdown-formatted string with docstrings as paragraphs and code as Python code blocks.
     """
-    with open(file_path, 'r', encoding='utf-8') as f:
-        file_content = f.read()
+    file_content = file_path.read_text(encoding='utf-8')
     
     lines = file_content.split('\n')
     processed_lines = []
-    in_code_block = False
-    code_block = []
-    in_docstring = False
-    docstring_lines = []
-    
-    for line in lines:
-        if line.strip().startswith('"""') or line.strip().startswith("'''"):
-            if in_docstring:
-                in_docstring = False
-                clean_docstring = []
-                for doc_line in docstring_lines:
-                    if doc_line.strip() in ('"""', "'''"):
-                        continue
-                    doc_line = doc_line.strip()
-                    if doc_line.startswith('"""') or doc_line.startswith("'''"):
-                        doc_line = doc_line[3:]
-                    if doc_line.endswith('"""') or doc_line.endswith("'''"):
-                        doc_line = doc_line[:-3]
-                    clean_docstring.append(doc_line.strip())
-                
-                if clean_docstring:
-                    processed_lines.append("")
-                    processed_lines.extend(clean_docstring)
-                    processed_lines.append("")
-                docstring_lines = []
-            else:
-                in_docstring = True
-                if in_code_block:
-                    processed_lines.append("```python")
-                    processed_lines.extend(code_block)
-                    processed_lines.append("```")
-                    code_block = []
-                    in_code_block = False
-            continue
-        
-        if in_docstring:
-            docstring_lines.append(line)
-            continue
-        
-        if not in_code_block and line.strip():
-            in_code_block = True
-            code_block.append(line)
-        elif in_code_block:
-            code_block.append(line)
-        else:
-            processed_lines.append(line)
     
-    if in_code_block:
-        processed_lines.append("```python")
-        processed_lines.extend(code_block)
-        processed_lines.append("```")
-    
-    if in_docstring:
-        processed_lines.append("")
-        processed_lines.extend(docstring_lines)
-        processed_lines.append("")
+    def append_code(code_lines):
+        # Blank lines before the code stay outside the fenced block
+        for index, line in enumerate(code_lines):
+            if line.strip():
+                processed_lines.extend(code_lines[:index])
+                processed_lines.append("```python")
+                processed_lines.extend(code_lines[index:])
+                processed_lines.append("```")
+                return
+        processed_lines.extend(code_lines)
+    
+    # Docstrings are found in one regex scan; line numbers are tracked by
+    # counting newlines between consecutive match offsets
+    next_line = 0
+    line_number = 0
+    offset = 0
+    for match in PYTHON_DOCSTRING_PATTERN.finditer(file_content):
+        line_number += file_content.count('\n', offset, match.start())
+        start_line = line_number
+        line_number += file_content.count('\n', match.start(), match.end())
+        offset = match.end()
+        
+        append_code(lines[next_line:start_line])
+        next_line = line_number + 1
+        
+        clean_docstring = [doc_line.strip() for doc_line in match.group(2).split('\n')]
+        while clean_docstring and not clean_docstring[0]:
+            clean_docstring.pop(0)
+        while clean_docstring and not clean_docstring[-1]:
+            clean_docstring.pop()
+        
+        if clean_docstring:
+            processed_lines.append("")
+            processed_lines.extend(clean_docstring)
+            processed_lines.append("")
+    
+    append_code(lines[next_line:])
     
     return '\n'.join(processed_lines)
 
@@ -567,10 +957,10 @@ def process_c_file(file_path: Path, literate_c_script: Path) -> str:
     Attempts to process the file with the specified literate-C script. If preprocessing fails,
     returns the file content wrapped in a Markdown C code block.
     """
-    with open(file_path, 'r', encoding='utf-8') as f:
-        file_content = f.read()
-    
-    markdown_content = f"""# {file_path.name}\n\n```c\n{file_content}\n```"""
+    def simple_markdown() -> str:
+        # Fallback, built only when literate-c fails: the source in a code block
+        file_content = file_path.read_text(encoding='utf-8')
+        return f"""# {file_path.name}\n\n```c\n{file_content}\n```"""
     
     literate_c_cmd = [str(literate_c_script), str(file_path), '0']
     
@@ -584,15 +974,16 @@ def process_c_file(file_path: Path, literate_c_script: Path) -> str:
         )
         content, stderr = preproc_proc.communicate()
 
-        if preproc_proc.returncode == 0 and content.strip():
+        # isspace() tests for blank output without copying it like strip() would
+        if preproc_proc.returncode == 0 and content and not content.isspace():
             return content.replace('~~~literatec', '~~~c')
         else:
             debug_print(f"  [Debug] Using simple markdown for {file_path} due to literate-c error: {stderr}")
-            return markdown_content
+            return simple_markdown()
             
     except Exception as e:
         debug_print(f"  [Debug] Using simple markdown for {file_path} due to error: {e}")
-        return markdown_content
+        return simple_markdown()
 
 def prepare_pandoc_input(file_path: Path, literate_c_script: Path) -> str:
     """
@@ -623,13 +1014,13 @@ def run_pandoc(pandoc_input: str, output_html_path: Path, template_path: Path,
     """
                Converts Markdown input to standalone HTML using Pandoc.
                
-               Runs Pandoc with a custom template and variables for SEO metadata, repository info, and asset paths to generate an HTML file from Markdown input. Handles SEO metadata and fixes malformed meta description tags. Returns Pandoc's standard output as a string.
+               Runs Pandoc with a custom template and variables for SEO metadata, repository info, and asset paths to generate an HTML page from Markdown input. Handles SEO metadata and fixes malformed meta description tags. The page is read from Pandoc's standard output rather than written to disk, so the caller can post-process it before its single write.
                
                Note: HTML cleaning (removal of empty anchor tags) is now handled by the separate clean_html.py script.
                
                Args:
                    pandoc_input: Markdown content to convert.
-                   output_html_path: Path to write the generated HTML file.
+                   output_html_path: Path the generated HTML page will be written to; used to pick per-page options and in messages.
                    template_path: Path to the Pandoc HTML template.
                    base_url: Base URL for the documentation site.
                    wiki_title: Title of the wiki or documentation set.
@@ -640,7 +1031,7 @@ def run_pandoc(pandoc_input: str, output_html_path: Path, template_path: Path,
                    source_path: Optional source file path for reference.
                
                Returns:
-                   The standard output from the Pandoc process as a string, or an empty string if Pandoc fails.
+                   The generated HTML page as a string, or an empty string if Pandoc fails.
                """
     if seo_metadata is None:
         seo_metadata = {}
@@ -672,69 +1063,58 @@ def run_pandoc(pandoc_input: str, output_html_path: Path, template_path: Path,
     is_jupyter_html = output_html_path.name.endswith('.ipynb.html')
     if is_shell_script or is_jupyter_html:
         pandoc_cmd.extend(['-V', 'mathjax=null'])
-        
-    pandoc_cmd.extend(['-o', str(output_html_path)])
     
-    debug_print(f"  [Debug Pandoc] Command: {' '.join(pandoc_cmd)}")
-    debug_print(f"  [Debug Pandoc] Input content length: {len(pandoc_input)} chars")
+    # Guarded so the long command line is only joined when debugging
+    if DEBUG:
+        debug_print(f"  [Debug Pandoc] Command: {' '.join(pandoc_cmd)}")
+        debug_print(f"  [Debug Pandoc] Input content length: {len(pandoc_input)} chars")
     
+    # One pandoc process per page: pandoc concatenates multiple inputs into a
+    # single document and every page has its own -V variables, so inputs
+    # cannot be batched. The startup cost is overlapped instead by running
+    # conversions in the process pool in main().
     process = subprocess.run(pandoc_cmd, input=pandoc_input, text=True, capture_output=True)
     
-    debug_print(f"  [Debug Pandoc] Return Code: {process.returncode}")
-    if process.stdout: debug_print(f"  [Debug Pandoc] STDOUT:\n{process.stdout}")
-    if process.stderr: debug_print(f"  [Debug Pandoc] STDERR:\n{process.stderr}")
+    if DEBUG:
+        debug_print(f"  [Debug Pandoc] Return Code: {process.returncode}")
+        debug_print(f"  [Debug Pandoc] Output length: {len(process.stdout)} chars")
+        if process.stderr: debug_print(f"  [Debug Pandoc] STDERR:\n{process.stderr}")
     
     if process.returncode != 0:
         print(f"Error running pandoc: {process.stderr}")
         return ""
     
-    try:
-        with open(output_html_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Fix any malformed meta description tags, especially for Jupyter notebooks
-        desc_meta_pattern = r'<meta\s+name="description"\s+content="([^"]*(?:target|href|class|style|onclick)[^"]*)"[^>]*>'
-        if re.search(desc_meta_pattern, content):
-            print(f"  Fixing malformed meta description tag in {output_html_path.name}")
-            # Remove the problematic description meta tags
-            content = re.sub(desc_meta_pattern, '', content)
-            
-            # Add a clean description meta tag in the head section if we have a description
-            if seo_metadata and "description" in seo_metadata and seo_metadata["description"]:
-                # Extra sanitization to be absolutely safe
-                clean_desc = re.sub(r'<[^>]*>', '', seo_metadata.get("description", ""))
-                clean_desc = re.sub(r'["\'<>\\\]', '', clean_desc)
-                clean_desc = html.escape(clean_desc)
-                
-                head_pos = content.find('</head>')
-                if head_pos > 0:
-                    meta_tag = f'  <meta name="description" content="{clean_desc}">\n  '
-                    content = content[:head_pos] + meta_tag + content[head_pos:]
-        
-        # Check if file has proper HTML structure
-        if '<!DOCTYPE' not in content or '<html' not in content:
-            print(f"Warning: Generated HTML for {output_html_path} is missing DOCTYPE or html tag")
-            fixed_content = f"""<!DOCTYPE html>
-<html xmlns="http://www.w3.org/1999/xhtml">
-<head>
-    <meta http-equiv="Content-Type" content="text/html; charset=UTF-8" />
-    <title>{wiki_title} - {page_title}</title>
-    <meta name="description" content="{seo_metadata.get('description', '')}" />
-    <meta name="keywords" content="{seo_metadata.get('keywords', '')}" />
-</head>
-<body>
-{content}
-</body>
-</html>"""
-            content = fixed_content
-            
-        with open(output_html_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+    content = process.stdout
+    
+    # Fix any malformed meta description tags, especially for Jupyter notebooks
+    if MALFORMED_DESC_META_PATTERN.search(content):
+        print(f"  Fixing malformed meta description tag in {output_html_path.name}")
+        # Remove the problematic description meta tags
+        content = MALFORMED_DESC_META_PATTERN.sub('', content)
+        
+        # Add a clean description meta tag in the head section if we have a description
+        if seo_metadata and "description" in seo_metadata and seo_metadata["description"]:
+            # Extra sanitization to be absolutely safe
+            clean_desc = HTML_TAG_PATTERN.sub('', seo_metadata.get("description", ""))
+            clean_desc = clean_desc.translate(ATTRIBUTE_UNSAFE_CHARS_TABLE)
+            # Quotes and angle brackets are already gone, so '&' is all
+            # html.escape would still have to replace
+            clean_desc = clean_desc.replace('&', '&amp;')
             
-    except Exception as e:
-        print(f"Error verifying HTML structure: {e}")
+            head_pos = content.find('</head>')
+            if head_pos > 0:
+                meta_tag = f'  <meta name="description" content="{clean_desc}">\n  '
+                content = content[:head_pos] + meta_tag + content[head_pos:]
+    
+    # Check if file has proper HTML structure
+    if '<!DOCTYPE' not in content or '<html' not in content:
+        print(f"Warning: Generated HTML for {output_html_path} is missing DOCTYPE or html tag")
+        head_lines = (f'    <title>{wiki_title} - {page_title}</title>\n'
+                      f'    <meta name="description" content="{seo_metadata.get("description", "")}" />\n'
+                      f'    <meta name="keywords" content="{seo_metadata.get("keywords", "")}" />\n')
+        content = FALLBACK_HTML_TEMPLATE % (head_lines, content)
     
-    return process.stdout
+    return content
 
 def post_process_python_shell_html(html_content: str) -> str:
     """
@@ -751,43 +1131,8 @@ def post_process_python_shell_html(html_content: str) -> str:
         The processed HTML content with enhanced formatting and navigation.
     """
     # Wrap code blocks with container divs
-    def wrap_pre_code(match):
-        """
-        Wraps a matched <pre><code> HTML block in a container div for styling.
-        
-        Args:
-            match: A regex match object containing a <pre><code> HTML block.
-        
-        Returns:
-            The HTML block wrapped in a div with class "code-block-container".
-        """
-        return f'<div class="code-block-container">{match.group(0)}</div>'
-    
-    processed_html = re.sub(
-        r'<pre[^>]*><code[^>]*>.*?</code></pre>', 
-        wrap_pre_code, 
-        html_content, 
-        flags=re.DOTALL | re.IGNORECASE
-    )
-    
-    def wrap_source_code(match):
-        """
-        Wraps matched source code in a div container for styling.
-        
-        Args:
-            match: A regex match object containing the code block as group 1.
-        
-        Returns:
-            The code block wrapped in a div with class "code-block-container".
-        """
-        return f'<div class="code-block-container">{match.group(1)}</div>'
-    
-    processed_html = re.sub(
-        r'<div class="sourceCode" id="cb\d+"[^>]*>(.*?)</div>', 
-        wrap_source_code, 
-        processed_html, 
-        flags=re.DOTALL | re.IGNORECASE
-    )
+    processed_html = wrap_code_blocks(html_content)
+    processed_html = wrap_source_code_divs(processed_html)
     
     # Fix links to docs by adding .html extension
     def fix_doc_links(match):
@@ -796,90 +1141,86 @@ def post_process_python_shell_html(html_content: str) -> str:
         
         This function is intended for use as a replacement callback in regular expression operations. It modifies anchor tags so that links to source files (with extensions .c, .h, .py, .sh, .md) are updated to point to their corresponding HTML documentation, unless the link is already external, an anchor, or already ends with '.html'.
         """
-        link_tag = match.group(0)
-        href_match = re.search(r'href="([^"]+)"', link_tag)
-        
-        if href_match:
-            href = href_match.group(1)
-            if (href.startswith('http') or href.startswith('https') or 
-                href.startswith('#') or href.endswith('.html')):
-                return link_tag
-                
-            if re.search(r'\.(c|h|py|sh|md)$', href):
-                return re.sub(r'href="([^"]+)"', f'href="{href}.html"', link_tag)
+        link_start, href, link_end = match.groups()
+        
+        if href.startswith(('http', '#')) or href.endswith('.html'):
+            return match.group(0)
+            
+        if SOURCE_LINK_EXTENSION_PATTERN.search(href):
+            return f'{link_start}{href}.html{link_end}'
         
-        return link_tag
+        return match.group(0)
     
-    processed_html = re.sub(
-        r'<a[^>]+href="[^"]+">[^<]+</a>',
-        fix_doc_links,
-        processed_html
-    )
+    processed_html = DOC_LINK_PATTERN.sub(fix_doc_links, processed_html)
     
     # Remove dynamic path related scripts
-    processed_html = re.sub(r'<script[^>]*>\s*// Dynamic base path resolution.*?</script>', '', processed_html, flags=re.DOTALL)
-    processed_html = re.sub(r'<script[^>]*>\s*// Helper function to create dynamic asset paths.*?</script>', '', processed_html, flags=re.DOTALL)
-    processed_html = re.sub(r'<script[^>]*>\s*window\.basePath\s*=.*?</script>', '', processed_html, flags=re.DOTALL)
-    processed_html = re.sub(r'<script[^>]*>\s*function\s+assetPath.*?</script>', '', processed_html, flags=re.DOTALL)
+    processed_html = remove_dynamic_path_scripts(processed_html)
 
     # Add repoName variable
     repo_script = f'\n<script>window.repoName = "{REPO_NAME}";</script>\n'
-    processed_html = re.sub(r'<body[^>]*>', lambda m: m.group(0) + repo_script, processed_html)
+    processed_html = insert_after_body_tag(processed_html, repo_script)
 
     return processed_html
 
-def run_awk_post_processing(html_content: str, file_path: Path, 
-                           repo_root: Path, darcsit_dir: Path) -> str:
-    """
-                           Runs an AWK script to add declaration anchors to HTML content generated from C files.
-                           
-                           Args:
-                               html_content: The HTML content to process.
-                               file_path: Path to the original C source file.
-                               repo_root: Path to the repository root for relative path resolution.
-                               darcsit_dir: Path to the directory containing the AWK script.
-                           
-                           Returns:
-                               The post-processed HTML content with declaration anchors added.
-                           
-                           Raises:
-                               FileNotFoundError: If the required AWK script is not found.
-                               RuntimeError: If the AWK post-processing fails.
-                           """
-    decl_anchors_script = darcsit_dir / 'decl_anchors.awk'
-    if not decl_anchors_script.is_file():
-        raise FileNotFoundError(f"decl_anchors.awk script not found at {decl_anchors_script}")
+def load_declaration_tags(tags_path: Path) -> Dict[str, str]:
+    """
+    Reads the declarations from a qcc .tags file, mapping each declaration's line number (field 4 of a "decl" line) to its anchor id (field 2).
     
+    Returns an empty dictionary if the file is missing or unreadable.
+    """
+    declarations = {}
+    try:
+        with open(tags_path, 'r', encoding='utf-8', errors='replace', newline='') as f:
+            tags_lines = f.read().split('\n')
+    except OSError:
+        return declarations
+    for line in tags_lines:
+        fields = line.split()
+        if fields and fields[0] == 'decl':
+            declarations[fields[3] if len(fields) > 3 else ''] = fields[1] if len(fields) > 1 else ''
+    return declarations
+
+def add_declaration_anchors(html_content: str, file_path: Path, repo_root: Path) -> str:
+    """
+    Adds line number and declaration anchors to HTML content generated from C files.
+    
+    A Python port of Basilisk's darcsit/decl_anchors.awk, run in-process rather than as an awk subprocess per C page. The "<pre>1" that opens the listing and every line holding only a line number become self-linking <a id="N"> anchors, each followed by a <span id="..."/> if the source's .tags file lists a declaration on that line. Like the awk script, it resolves the .tags path, relative to the repository root, from the current directory and ends the output with a newline.
+    
+    Args:
+        html_content: The HTML content to process.
+        file_path: Path to the original C source file.
+        repo_root: Path to the repository root for relative path resolution.
+    
+    Returns:
+        The post-processed HTML content with declaration anchors added.
+    """
     try:
         relative_tags_path = file_path.relative_to(repo_root).with_suffix(file_path.suffix + '.tags')
     except ValueError:
         print(f"Error: {file_path} is not under repository root {repo_root}")
         return html_content
-    temp_output_path = Path(f"{file_path}.temp.html")
     
-    try:
-        with open(temp_output_path, 'w', encoding='utf-8') as f_out:
-            postproc_cmd = ['awk', '-v', f'tags={relative_tags_path}', '-f', str(decl_anchors_script)]
-            postproc_proc = subprocess.Popen(
-                postproc_cmd, 
-                stdin=subprocess.PIPE, 
-                stdout=f_out, 
-                stderr=subprocess.PIPE, 
-                text=True, 
-                encoding='utf-8'
-            )
-            _, stderr = postproc_proc.communicate(input=html_content)
-
-            if postproc_proc.returncode != 0:
-                raise RuntimeError(f"Awk post-processing failed: {stderr}")
-        
-        with open(temp_output_path, 'r', encoding='utf-8') as f:
-            processed_content = f.read()
-        
-        return processed_content
-    finally:
-        if temp_output_path.exists():
-            temp_output_path.unlink()
+    if not html_content:
+        return html_content
+    declarations = load_declaration_tags(relative_tags_path)
+    
+    def anchor_line(match):
+        line_number = match.group(1)
+        if line_number is None:
+            line_number = '1'
+            anchored = '<pre><a id="1" href="#1">1</a>'
+        else:
+            anchored = f'<a id="{line_number}" href="#{line_number}">{line_number}</a>'
+        declaration = declarations.get(line_number)
+        if declaration:
+            anchored += f'<span id="{declaration}"/>'
+        return anchored
+    
+    # awk treats a final newline as ending the last line rather than
+    # starting an empty one, and always terminates its output
+    if html_content.endswith('\n'):
+        html_content = html_content[:-1]
+    return DECL_ANCHOR_LINE_PATTERN.sub(anchor_line, html_content) + '\n'
 
 def post_process_c_html(html_content: str, file_path: Path, 
                       repo_root: Path, darcsit_dir: Path, docs_dir: Path) -> str:
@@ -901,52 +1242,19 @@ def post_process_c_html(html_content: str, file_path: Path,
                           The post-processed HTML content as a string.
                       """
     # Remove trailing line numbers
-    cleaned_html = re.sub(
-        r'(\s*(?:<span class="[^"]*">\s*\d+\s*</span>|\s+\d+)\s*)+(\s*</span>)', 
-        r'\2', 
-        html_content
-    )
+    cleaned_html = TRAILING_LINE_NUMBER_PATTERN.sub('</span>', html_content)
     
     # Wrap code blocks with container divs
-    def wrap_pre_code(match):
-        """
-        Wraps a matched code block in a container div for styling.
-        
-        Args:
-            match: A regex match object representing a code block.
-        
-        Returns:
-            The HTML string with the code block wrapped in a div.
-        """
-        return f'<div class="code-block-container">{match.group(0)}</div>'
-    
-    cleaned_html = re.sub(
-        r'<pre[^>]*><code[^>]*>.*?</code></pre>', 
-        wrap_pre_code, 
-        cleaned_html, 
-        flags=re.DOTALL | re.IGNORECASE
-    )
-    
-    def wrap_source_code(match):
-        """
-        Wraps matched source code in a div container for styling.
-        
-        Args:
-            match: A regex match object containing the code block as group 1.
-        
-        Returns:
-            The code block wrapped in a div with class "code-block-container".
-        """
-        return f'<div class="code-block-container">{match.group(1)}</div>'
+    cleaned_html = wrap_code_blocks(cleaned_html)
+    cleaned_html = wrap_source_code_divs(cleaned_html)
     
-    cleaned_html = re.sub(
-        r'<div class="sourceCode" id="cb\d+"[^>]*>(.*?)</div>', 
-        wrap_source_code, 
-        cleaned_html, 
-        flags=re.DOTALL | re.IGNORECASE
-    )
+    # Add links to #include statements; the link depends only on the
+    # included name, so it is worked out once per name and page
+    src_local_dir = repo_root / 'src-local'
+    docs_src_local_dir = docs_dir / 'src-local'
+    source_dir = file_path.parent
+    include_links = {}
     
-    # Add links to #include statements
     def create_include_link(match):
         """
         Generates an HTML link for a C/C++ #include statement, pointing to local documentation if available or to the Basilisk source otherwise.
@@ -964,96 +1272,64 @@ def post_process_c_html(html_content: str, file_path: Path,
         
         original_span_tag = f'{span_tag_open}\"{filename}\"{span_tag_close}'
         
-        check_filename = filename.split('/')[-1]
-        local_file_path = repo_root / 'src-local' / check_filename
-        
-        if local_file_path.is_file():
-            target_html_path = (docs_dir / 'src-local' / check_filename).with_suffix(local_file_path.suffix + '.html')
-            try:
-                relative_link = os.path.relpath(target_html_path, start=file_path.parent)
-                link_url = relative_link.replace('\\', '/')
-                link_url = link_url.replace('/docs/', '/')
-            except ValueError:
-                link_url = target_html_path.as_uri()
-            link_title = f"Link to local documentation for {filename}"
-        else:
-            link_url = f"http://basilisk.fr/src/{filename}"
-            link_title = f"Link to Basilisk source for {filename}"
+        link_attributes = include_links.get(filename)
+        if link_attributes is None:
+            check_filename = filename.split('/')[-1]
+            local_file_path = src_local_dir / check_filename
+            
+            if local_file_path.is_file():
+                target_html_path = (docs_src_local_dir / check_filename).with_suffix(local_file_path.suffix + '.html')
+                try:
+                    relative_link = os.path.relpath(target_html_path, start=source_dir)
+                    link_url = relative_link.replace('\\', '/')
+                    link_url = link_url.replace('/docs/', '/')
+                except ValueError:
+                    link_url = target_html_path.as_uri()
+                link_title = f"Link to local documentation for {filename}"
+            else:
+                link_url = f"http://basilisk.fr/src/{filename}"
+                link_title = f"Link to Basilisk source for {filename}"
+            
+            link_attributes = include_links[filename] = f'href="{link_url}" title="{link_title}"'
         
-        return f'{prefix}<a href="{link_url}" title="{link_title}">{original_span_tag}</a>'
+        return f'{prefix}<a {link_attributes}>{original_span_tag}</a>'
     
-    include_pattern = r'(<span class="pp">#include\s*</span>)(<span class=\"im\">)(?:\"|&quot;)(.*?)(?:\"|&quot;)(</span>)'
-    cleaned_html = re.sub(include_pattern, create_include_link, cleaned_html, flags=re.DOTALL)
+    if '#include' in cleaned_html:
+        cleaned_html = INCLUDE_SPAN_PATTERN.sub(create_include_link, cleaned_html)
     
     # Remove script tags related to dynamic paths
-    cleaned_html = re.sub(r'<script[^>]*>\s*// Dynamic base path resolution.*?</script>', '', cleaned_html, flags=re.DOTALL)
-    cleaned_html = re.sub(r'<script[^>]*>\s*// Helper function to create dynamic asset paths.*?</script>', '', cleaned_html, flags=re.DOTALL)
-    cleaned_html = re.sub(r'<script[^>]*>\s*window\.basePath\s*=.*?</script>', '', cleaned_html, flags=re.DOTALL)
-    cleaned_html = re.sub(r'<script[^>]*>\s*function\s+assetPath.*?</script>', '', cleaned_html, flags=re.DOTALL)
+    cleaned_html = remove_dynamic_path_scripts(cleaned_html)
     
     # Add repoName variable
     repo_script = f'\n<script>window.repoName = "{REPO_NAME}";</script>\n'
-    cleaned_html = re.sub(r'<body[^>]*>', lambda m: m.group(0) + repo_script, cleaned_html)
+    cleaned_html = insert_after_body_tag(cleaned_html, repo_script)
     
     return cleaned_html
 
-def insert_css_link_in_html(html_file_path: Path, css_path: Path, is_root: bool = True) -> bool:
+def insert_css_link_in_html(html_content: str, css_path: Path, is_root: bool = True) -> str:
     """
-    Inserts a CSS link tag into the <head> section of an HTML file.
+    Inserts a CSS link tag into the <head> section of an HTML document.
     
-    If the <head> tag is missing, creates a minimal HTML structure with the CSS link included. Returns True on success, or False if an error occurs.
-    """
-    try:
-        with open(html_file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        css_name = str(Path(css_path).name)
-        css_link = f'<link href="{css_name}" rel="stylesheet" type="text/css" />' if is_root else \
-                  f'<link href="../{css_name}" rel="stylesheet" type="text/css" />'
-        
-        if f'link href="{css_name}"' in content or f'link href="../{css_name}"' in content:
-            return True
-        
-        head_end_idx = content.find('</head>')
-        if head_end_idx == -1:
-            head_start_idx = content.find('<head>')
-            if head_start_idx != -1:
-                modified_content = content[:head_start_idx + 6] + '\n    ' + css_link + content[head_start_idx + 6:]
-            else:
-                debug_print(f"Warning: No head tag found in {html_file_path}, creating complete HTML structure")
-                modified_content = f"""<!DOCTYPE html>
-<html xmlns="http://www.w3.org/1999/xhtml">
-<head>
-    <meta http-equiv="Content-Type" content="text/html; charset=UTF-8" />
-    {css_link}
-</head>
-<body>
-{content}
-</body>
-</html>"""
-        else:
-            modified_content = content[:head_end_idx] + '    ' + css_link + '\n    ' + content[head_end_idx:]
-        
-        with open(html_file_path, 'w', encoding='utf-8') as f:
-            f.write(modified_content)
-        
-        return True
-    except Exception as e:
-        print(f"Error inserting CSS link in {html_file_path}: {e}")
-        return False
-
-def insert_javascript_in_html(html_file_path: Path) -> bool:
+    If the <head> tag is missing, creates a minimal HTML structure with the CSS link included. Returns the content unchanged if the link is already present.
     """
-    Inserts inline JavaScript into an HTML file to add copy-to-clipboard buttons on code blocks.
+    css_name = str(Path(css_path).name)
+    css_link = f'<link href="{css_name}" rel="stylesheet" type="text/css" />' if is_root else \
+              f'<link href="../{css_name}" rel="stylesheet" type="text/css" />'
     
-    Adds a "Copy" button to each code block container, enabling users to copy code snippets to the clipboard. If the HTML file lacks a <body> tag, a minimal HTML structure is created. Returns True if the script is inserted or already present, False on error.
-    """
-    try:
-        with open(html_file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # JS for copy functionality
-        copy_js = '''
+    if f'link href="{css_name}"' in html_content or f'link href="../{css_name}"' in html_content:
+        return html_content
+    
+    head_end_idx = html_content.find('</head>')
+    if head_end_idx == -1:
+        head_start_idx = html_content.find('<head>')
+        if head_start_idx != -1:
+            return html_content[:head_start_idx + 6] + '\n    ' + css_link + html_content[head_start_idx + 6:]
+        debug_print("Warning: No head tag found, creating complete HTML structure")
+        return FALLBACK_HTML_TEMPLATE % (f'    {css_link}\n', html_content)
+    return html_content[:head_end_idx] + '    ' + css_link + '\n    ' + html_content[head_end_idx:]
+
+# Copy-to-clipboard script inserted into every page, built once at import
+COPY_BUTTON_SCRIPT = '''
 <script type="text/javascript">
 document.addEventListener('DOMContentLoaded', function() {
     // Add copy button to each code block container
@@ -1124,37 +1400,23 @@ document.addEventListener('DOMContentLoaded', function() {
 });
 </script>
         '''
-        
-        if 'class="copy-button"' in content:
-            return True
-        
-        body_end_idx = content.find('</body>')
-        if body_end_idx == -1:
-            body_start_idx = content.find('<body>')
-            if body_start_idx != -1:
-                modified_content = content + copy_js
-            else:
-                debug_print(f"Warning: No body tag found in {html_file_path}, creating complete HTML structure")
-                modified_content = f"""<!DOCTYPE html>
-<html xmlns="http://www.w3.org/1999/xhtml">
-<head>
-    <meta http-equiv="Content-Type" content="text/html; charset=UTF-8" />
-</head>
-<body>
-{content}
-{copy_js}
-</body>
-</html>"""
-        else:
-            modified_content = content[:body_end_idx] + copy_js + content[body_end_idx:]
-        
-        with open(html_file_path, 'w', encoding='utf-8') as f:
-            f.write(modified_content)
-        
-        return True
-    except Exception as e:
-        print(f"Error inserting JavaScript in {html_file_path}: {e}")
-        return False
+
+def insert_javascript_in_html(html_content: str) -> str:
+    """
+    Inserts inline JavaScript into an HTML document to add copy-to-clipboard buttons on code blocks.
+    
+    Adds a "Copy" button to each code block container, enabling users to copy code snippets to the clipboard. If the document lacks a <body> tag, a minimal HTML structure is created. Returns the content unchanged if the script is already present.
+    """
+    if 'class="copy-button"' in html_content:
+        return html_content
+    
+    body_end_idx = html_content.find('</body>')
+    if body_end_idx == -1:
+        if html_content.find('<body>') != -1:
+            return html_content + COPY_BUTTON_SCRIPT
+        debug_print("Warning: No body tag found, creating complete HTML structure")
+        return FALLBACK_HTML_TEMPLATE % ('', html_content + '\n' + COPY_BUTTON_SCRIPT)
+    return html_content[:body_end_idx] + COPY_BUTTON_SCRIPT + html_content[body_end_idx:]
 
 def process_file_with_page2html_logic(file_path: Path, output_html_path: Path, repo_root: Path, 
                                      basilisk_dir: Path, darcsit_dir: Path, template_path: Path, 
@@ -1172,27 +1434,24 @@ def process_file_with_page2html_logic(file_path: Path, output_html_path: Path, r
         Removes any malformed HTML constructs that could cause problems after conversion.
         """
         # Convert self-closing a tags to proper a tags to avoid malformed HTML after conversion
-        input_content = re.sub(r'<a([^>]*)/>',
-                              r'<a\1></a>',
-                              input_content)
+        input_content = SELF_CLOSING_ANCHOR_PATTERN.sub(r'<a\1></a>', input_content)
         
         # Escape or convert script blocks in code examples to avoid JavaScript syntax errors  
         def escape_script_blocks(match):
             html_content = match.group(1)
             # Replace any potential anchor tags in script examples with harmless placeholders
-            html_content = re.sub(r'<a\s+[^>]*>\s*</a>',
-                                '/* anchor tag removed */',
-                                html_content)
+            html_content = EMPTY_ANCHOR_TAG_PATTERN.sub('/* anchor tag removed */', html_content)
             return f"{html_content}"
             
-        input_content = re.sub(r'```html(.*?)```',
-                              escape_script_blocks,
-                              input_content,
-                              flags=re.DOTALL)
+        input_content = HTML_CODE_FENCE_PATTERN.sub(escape_script_blocks, input_content)
                               
         return input_content
     
-    print(f"  Processing {file_path.relative_to(repo_root)} -> {output_html_path.relative_to(repo_root / 'docs')}")
+    # Source and page paths relative to the repo and docs roots, used below
+    relative_source_path = file_path.relative_to(repo_root)
+    relative_output_path = output_html_path.relative_to(repo_root / 'docs')
+    
+    print(f"  Processing {relative_source_path} -> {relative_output_path}")
 
     try:
         # Handle Jupyter notebook special case
@@ -1212,10 +1471,10 @@ def process_file_with_page2html_logic(file_path: Path, output_html_path: Path, r
         pandoc_input_content = sanitize_pandoc_input(pandoc_input_content)
         
         # Calculate relative URL path
-        page_url = (base_url + output_html_path.relative_to(repo_root / 'docs').as_posix()).replace('//', '/')
+        page_url = (base_url + relative_output_path.as_posix()).replace('//', '/')
         
         # Clean up page title
-        page_title = file_path.relative_to(repo_root).as_posix().strip('- \t')
+        page_title = relative_source_path.as_posix().strip('- \t')
         
         # Debug info
         print(f"Processing file: {file_path.name} with REPO_NAME={REPO_NAME}")
@@ -1227,10 +1486,10 @@ def process_file_with_page2html_logic(file_path: Path, output_html_path: Path, r
         asset_path_prefix = calculate_asset_prefix(output_html_path, docs_dir)
         
         # Get source path relative to repo root
-        source_path = file_path.relative_to(repo_root).as_posix()
+        source_path = relative_source_path.as_posix()
         
         # Run pandoc for conversion
-        pandoc_stdout = run_pandoc(
+        html_content = run_pandoc(
             pandoc_input_content, 
             output_html_path, 
             template_path, 
@@ -1248,31 +1507,25 @@ def process_file_with_page2html_logic(file_path: Path, output_html_path: Path, r
         is_shell_file = file_path.suffix.lower() == '.sh'
         is_markdown_file = file_path.suffix.lower() == '.md'
         
+        if not html_content:
+            return False
+        
         # Apply appropriate post-processing
         if is_python_file or is_shell_file or is_markdown_file or is_jupyter_notebook:
-            with open(output_html_path, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-            
             processed_html = post_process_python_shell_html(html_content)
-            
-            with open(output_html_path, 'w', encoding='utf-8') as f:
-                f.write(processed_html)
         else:
             # For C/C++ files
-            with open(output_html_path, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-            
-            # Use awk for post-processing
-            processed_html = run_awk_post_processing(html_content, file_path, repo_root, darcsit_dir)
+            # Add line number and declaration anchors
+            processed_html = add_declaration_anchors(html_content, file_path, repo_root)
             
             # Further post-process
-            cleaned_html = post_process_c_html(processed_html, file_path, repo_root, darcsit_dir, docs_dir)
-            
-            with open(output_html_path, 'w', encoding='utf-8') as f:
-                f.write(cleaned_html)
+            processed_html = post_process_c_html(processed_html, file_path, repo_root, darcsit_dir, docs_dir)
         
         # Insert JavaScript for code blocks
-        insert_javascript_in_html(output_html_path)
+        processed_html = insert_javascript_in_html(processed_html)
+        
+        with open(output_html_path, 'w', encoding='utf-8') as f:
+            f.write(processed_html)
         
         return True
     
@@ -1280,6 +1533,25 @@ def process_file_with_page2html_logic(file_path: Path, output_html_path: Path, r
         print(f"  Error processing {file_path}: {e}")
         return False
 
+def convert_source_file(paths: tuple, common_args: tuple) -> tuple:
+    """
+    Converts one source file in a worker process.
+    
+    Runs process_file_with_page2html_logic with its progress messages captured rather than printed, so output from parallel workers does not interleave; main prints them in source order.
+    
+    Args:
+        paths: Tuple of the source file path and its output HTML path.
+        common_args: The remaining process_file_with_page2html_logic arguments, from repo_root to docs_dir.
+    
+    Returns:
+        A (success, output) tuple with the conversion result and the captured messages.
+    """
+    file_path, output_html_path = paths
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        success = process_file_with_page2html_logic(file_path, output_html_path, *common_args)
+    return success, output.getvalue()
+
 def convert_directory_tree_to_html(readme_content: str) -> str:
     """
     Converts a plain text directory tree block in README content into an HTML-formatted site map.
@@ -1292,8 +1564,12 @@ def convert_directory_tree_to_html(readme_content: str) -> str:
     Returns:
         The modified README content with the directory tree replaced by an HTML site map.
     """
-    tree_pattern = r'```\s*\n(├.*?\n.*?└.*?)\n```'
-    tree_match = re.search(tree_pattern, readme_content, re.DOTALL)
+    # Every tree block holds a '├'; without one the DOTALL search, which
+    # would try each code fence in the README, cannot match
+    if '├' not in readme_content:
+        return readme_content
+    
+    tree_match = README_TREE_PATTERN.search(readme_content)
     
     if not tree_match:
         return readme_content
@@ -1309,15 +1585,11 @@ def convert_directory_tree_to_html(readme_content: str) -> str:
         if not line.strip():
             continue
             
-        indent_level = 0
-        
-        if '│   ' in line:
-            indent_level = line.count('│   ')
-        elif '    ' in line and ('├── ' in line or '└── ' in line):
-            spaces_before_item = len(line) - len(line.lstrip(' '))
-            indent_level = spaces_before_item // 4
-        
-        clean_line = line.replace('├── ', '').replace('└── ', '').replace('│   ', '')
+        # The tree drawing only ever prefixes the entry, so one lstrip removes
+        # it, and its width gives the depth: four columns per ancestor level
+        # plus the entry's own '├── ' or '└── '
+        clean_line = line.lstrip(TREE_PREFIX_CHARS)
+        indent_level = max((len(line) - len(clean_line)) // 4 - 1, 0)
         
         parts = clean_line.strip().split(None, 1)
         path = parts[0]
@@ -1366,6 +1638,26 @@ def convert_directory_tree_to_html(readme_content: str) -> str:
     
     return modified_content
 
+def read_page_description(html_path: Path) -> str:
+    """
+    Returns the meta description of a generated page, or "" if it has none.
+    
+    Reads the page as bytes only up to the end of its head, where the meta tag lives, and falls back to the whole page if the head has no match. The regex only runs on data that contains its literal 'name="description"', which a substring search rules out much faster, and only the matched description is decoded.
+    """
+    chunks = []
+    with open(html_path, 'rb') as page:
+        while True:
+            chunk = page.read(8192)
+            chunks.append(chunk)
+            if not chunk or b'</head>' in chunk:
+                break
+        data = b''.join(chunks)
+        desc_match = META_DESCRIPTION_PATTERN.search(data) if b'name="description"' in data else None
+        if not desc_match and chunk:
+            data += page.read()
+            desc_match = META_DESCRIPTION_PATTERN.search(data) if b'name="description"' in data else None
+    return desc_match.group(1).decode('utf-8') if desc_match else ""
+
 def generate_directory_index(directory_name: str, directory_path: Path, generated_files: Dict[Path, Path], docs_dir: Path, repo_root: Path) -> bool:
     """
     Generates an index.html page for a directory, listing all generated documentation files.
@@ -1385,113 +1677,99 @@ def generate_directory_index(directory_name: str, directory_path: Path, generate
                     "html_path": relative_html_path,
                     "original_path": relative_original_path,
                     "name": relative_original_path.name,
+                    "sort_key": relative_original_path.name.lower(),
                     "description": "",
                 }
                 
-        # Extract descriptions
-        for html_path, info in directory_files.items():
-            try:
-                html_content = html_path.read_text(encoding='utf-8')
-                desc_match = re.search(r'<meta\s+name="description"\s+content="([^"]+)"', html_content)
-                if desc_match:
-                    description = desc_match.group(1).strip()
-                    if len(description) > 120:
-                        description = description[:117] + "..."
-                    info["description"] = description
-            except Exception as e:
-                print(f"Error extracting description from {html_path}: {e}")
+        # Extract descriptions. The page reads run on a few threads, as file
+        # I/O releases the GIL; results are taken in order so any errors
+        # print as before
+        if directory_files:
+            from concurrent.futures import ThreadPoolExecutor
+            
+            with ThreadPoolExecutor(max_workers=min(8, len(directory_files))) as pool:
+                description_reads = [
+                    (html_path, info, pool.submit(read_page_description, html_path))
+                    for html_path, info in directory_files.items()
+                ]
+                for html_path, info, description_read in description_reads:
+                    try:
+                        description = description_read.result().strip()
+                        if description:
+                            info["description"] = description if len(description) <= 120 else f"{description[:117]}..."
+                    except Exception as e:
+                        print(f"Error extracting description from {html_path}: {e}")
         
-        # Read template
-        template_path = TEMPLATE_PATH
-        try:
-            with open(template_path, 'r', encoding='utf-8') as f:
-                template_content = f.read()
-        except Exception as e:
-            print(f"Error reading template: {e}")
-            return False
+        # Template processed once by validate_config
+        template_content = PROCESSED_TEMPLATE
             
         # Format directory name for title
         formatted_dir_name = directory_name.capitalize()
-        if formatted_dir_name == 'Src-local':
-            formatted_dir_name = "Local Source Files"
-        elif formatted_dir_name == 'Simulationcases':
-            formatted_dir_name = "Simulation Cases"  
-        elif formatted_dir_name == 'Postprocess':
-            formatted_dir_name = "Post-Processing Tools"
+        formatted_dir_name = DIRECTORY_TITLES.get(formatted_dir_name, formatted_dir_name)
             
         # Create TOC content
-        toc_html = f"<h1>{formatted_dir_name}</h1>\n\n"
+        toc_parts = [f"<h1>{formatted_dir_name}</h1>\n\n"]
         
         if directory_files:
-            toc_html += '<div class="documentation-section">\n'
-            toc_html += '<table class="documentation-files">\n'
+            toc_parts.append('<div class="documentation-section">\n<table class="documentation-files">\n')
             
-            # Sort files by name
-            sorted_files = sorted(directory_files.values(), key=lambda x: x['original_path'].name.lower())
+            # Sort files by name, using the key stored with each file
+            sorted_files = sorted(directory_files.values(), key=itemgetter("sort_key"))
             
             for info in sorted_files:
                 file_extension = info["original_path"].suffix.lower()
-                file_type_class = "file-other"
-                
-                if file_extension in [".c", ".h"]:
-                    file_type_class = "file-c"
-                elif file_extension in [".py"]:
-                    file_type_class = "file-python"
-                elif file_extension in [".ipynb"]:
-                    file_type_class = "file-jupyter"
+                file_type_class = FILE_TYPE_CLASSES.get(file_extension, "file-other")
                     
                 file_name = info["name"]
                 
-                toc_html += f'<tr>\n'
-                toc_html += f'  <td class="file-icon"><span class="{file_type_class}"></span></td>\n'
-                toc_html += f'  <td class="file-link" style="padding-right: 2em;"><a href="{info["html_path"]}" class="doc-link-button">{file_name}</a></td>\n'
-                toc_html += f'  <td class="file-desc">{info["description"]}</td>\n'
-                toc_html += f'</tr>\n'
+                toc_parts.append(
+                    f'<tr>\n'
+                    f'  <td class="file-icon"><span class="{file_type_class}"></span></td>\n'
+                    f'  <td class="file-link" style="padding-right: 2em;"><a href="{info["html_path"]}" class="doc-link-button">{file_name}</a></td>\n'
+                    f'  <td class="file-desc">{info["description"]}</td>\n'
+                    f'</tr>\n'
+                )
                 
-            toc_html += '</table>\n'
-            toc_html += '</div>\n'
+            toc_parts.append('</table>\n</div>\n')
         else:
-            toc_html += '<p>No documentation files found in this directory.</p>\n'
+            toc_parts.append('<p>No documentation files found in this directory.</p>\n')
+        toc_html = ''.join(toc_parts)
             
-        # Replace template variables
+        # Replace template variables, with the asset prefix based on depth
         page_title = f"{formatted_dir_name} | Documentation"
-        html_content = template_content
-        html_content = html_content.replace("$if(pagetitle)$$pagetitle$$endif$$if(wikititle)$ | $wikititle$$endif$", page_title)
-        html_content = html_content.replace(
-            "$if(description)$$description$$else$Computational fluid dynamics simulations using Basilisk C framework.$endif$", 
-            "Documentation for the CoMPhy-Lab computational fluid dynamics framework."
-        )
-        html_content = html_content.replace(
-            "$if(keywords)$$keywords$$else$fluid dynamics, CFD, Basilisk, multiphase flow, computational physics$endif$", 
-            f"fluid dynamics, CFD, Basilisk, {directory_name}, documentation"
-        )
-        html_content = html_content.replace("$if(reponame)$$reponame$$else$Documentation$endif$", REPO_NAME)
-        
-        # Replace asset prefix based on depth
         asset_path_prefix = calculate_asset_prefix(index_path, docs_dir)
-        html_content = html_content.replace("$asset_path_prefix$", asset_path_prefix)
+        placeholder_values = {
+            DIRECTORY_INDEX_PLACEHOLDERS['pagetitle']: page_title,
+            DIRECTORY_INDEX_PLACEHOLDERS['description']: "Documentation for the CoMPhy-Lab computational fluid dynamics framework.",
+            DIRECTORY_INDEX_PLACEHOLDERS['keywords']: f"fluid dynamics, CFD, Basilisk, {directory_name}, documentation",
+            DIRECTORY_INDEX_PLACEHOLDERS['reponame']: REPO_NAME,
+            DIRECTORY_INDEX_PLACEHOLDERS['asset_path_prefix']: asset_path_prefix,
+        }
+        html_content = DIRECTORY_INDEX_PLACEHOLDER_PATTERN.sub(
+            lambda match: placeholder_values[match.group(0)], template_content
+        )
         
         # Handle conditional blocks
         if "$if(tabs)$" in html_content:
-            html_content = re.sub(r'\$if\(tabs\)\$(.*?)\$tabs\$(.*?)\$endif\$', '', html_content, flags=re.DOTALL)
+            html_content = TEMPLATE_TABS_BLOCK_PATTERN.sub('', html_content)
         
         # Replace main content
         content_replacement = toc_html
-        html_content = re.sub(
-            r'<div class="page-content">\s*.*?\$body\$.*?</div>', 
-            f'<div class="page-content">\n{content_replacement}\n</div>', 
-            html_content, flags=re.DOTALL
-        )
+        if "$body$" in html_content:
+            html_content = TEMPLATE_BODY_PATTERN.sub(
+                f'<div class="page-content">\n{content_replacement}\n</div>', 
+                html_content
+            )
         
-        # Remove remaining template variables
-        html_content = re.sub(r'\$[a-zA-Z0-9_]+\$', '', html_content)
-        html_content = re.sub(r'\$if\([^)]+\)\$.*?\$endif\$', '', html_content, flags=re.DOTALL)
+        # Remove remaining template variables; like the tabs block above,
+        # each pattern only runs if the literal it needs is in the page
+        if "$" in html_content:
+            html_content = TEMPLATE_VARIABLE_PATTERN.sub('', html_content)
+        if "$if(" in html_content:
+            html_content = TEMPLATE_IF_BLOCK_PATTERN.sub('', html_content)
         
         # Clean up any dynamic path scripts
-        html_content = re.sub(r'<script[^>]*>\s*// Dynamic base path resolution.*?</script>', '', html_content, flags=re.DOTALL)
-        html_content = re.sub(r'<script[^>]*>\s*// Helper function to create dynamic asset paths.*?</script>', '', html_content, flags=re.DOTALL)
-        html_content = re.sub(r'<script[^>]*>\s*window\.basePath\s*=.*?</script>', '', html_content, flags=re.DOTALL)
-        html_content = re.sub(r'<script[^>]*>\s*function\s+assetPath.*?</script>', '', html_content, flags=re.DOTALL)
+        html_content = remove_dynamic_path_scripts(html_content)
 
         # Write the HTML file
         index_path.write_text(html_content, encoding='utf-8')
@@ -1535,7 +1813,8 @@ def generate_index(readme_path: Path, index_path: Path, generated_files: Dict[Pa
         print(f"Warning: README.md not found at {readme_path}")
         readme_content = "# Project Documentation\n"
     else:
-        readme_content = readme_path.read_text(encoding='utf-8')
+        # Already read at import to extract the wiki title
+        readme_content = read_source_text(readme_path)
         
     # Convert directory tree to HTML
     readme_content = convert_directory_tree_to_html(readme_content)
@@ -1591,7 +1870,6 @@ def generate_index(readme_path: Path, index_path: Path, generated_files: Dict[Pa
         '-V', 'notitle=true',
         '-V', f'pagetitle={WIKI_TITLE}',
         '-V', f'asset_path_prefix={asset_path_prefix}',
-        '-o', str(index_path)
     ]
 
     debug_print(f"  [Debug Index] Target path: {index_path}")
@@ -1603,21 +1881,18 @@ def generate_index(readme_path: Path, index_path: Path, generated_files: Dict[Pa
         print(f"Error generating index.html: {process.stderr}")
         return False
     
-    # Post-process index.html for code blocks
+    # Post-process index.html for code blocks, straight from pandoc's output
     try:
-        with open(index_path, 'r', encoding='utf-8') as f_in:
-            index_html_content = f_in.read()
+        processed_html = post_process_python_shell_html(process.stdout)
         
-        processed_html = post_process_python_shell_html(index_html_content)
+        # Insert JavaScript
+        processed_html = insert_javascript_in_html(processed_html)
         
         with open(index_path, 'w', encoding='utf-8') as f_out:
             f_out.write(processed_html)
             
     except Exception as e:
         print(f"Warning: Failed to process code blocks in {index_path}: {e}")
-
-    # Insert JavaScript
-    insert_javascript_in_html(index_path)
     
     return True
 
@@ -1634,10 +1909,12 @@ def generate_robots_txt(docs_dir: Path) -> bool:
     robots_path = docs_dir / 'robots.txt'
     
     try:
-        with open(robots_path, 'w', encoding='utf-8') as f:
-            f.write('User-agent: *\n')
-            f.write('Allow: /\n\n')
-            f.write(f'Sitemap: {BASE_DOMAIN}/sitemap.xml\n')
+        robots_path.write_text(
+            'User-agent: *\n'
+            'Allow: /\n\n'
+            f'Sitemap: {BASE_DOMAIN}/sitemap.xml\n',
+            encoding='utf-8'
+        )
         
         debug_print(f"Generated robots.txt at {robots_path}")
         return True
@@ -1655,35 +1932,25 @@ def generate_sitemap(docs_dir: Path, generated_files: Dict[Path, Path]) -> bool:
     sitemap_path = docs_dir / 'sitemap.xml'
     
     try:
-        with open(sitemap_path, 'w', encoding='utf-8') as f:
-            f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
-            f.write('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
-            
-            # Add homepage
-            f.write('  <url>\n')
-            f.write(f'    <loc>{BASE_DOMAIN}/</loc>\n')
-            f.write('    <changefreq>weekly</changefreq>\n')
-            f.write('    <priority>1.0</priority>\n')
-            f.write('  </url>\n')
+        # Homepage first, then all HTML files
+        sitemap_parts = [
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+            '  <url>\n'
+            f'    <loc>{BASE_DOMAIN}/</loc>\n'
+            '    <changefreq>weekly</changefreq>\n'
+            '    <priority>1.0</priority>\n'
+            '  </url>\n'
+        ]
+        for html_path in generated_files.values():
+            url_path = html_path.relative_to(docs_dir).as_posix()
             
-            # Add all HTML files
-            for _, html_path in generated_files.items():
-                relative_path = html_path.relative_to(docs_dir)
-                url_path = str(relative_path).replace('\\', '/')
-                
-                f.write('  <url>\n')
-                f.write(f'    <loc>{BASE_DOMAIN}/{url_path}</loc>\n')
-                f.write('    <changefreq>monthly</changefreq>\n')
-                
-                # Higher priority for important files
-                if 'index' in url_path or url_path.startswith('src-local/'):
-                    f.write('    <priority>0.8</priority>\n')
-                else:
-                    f.write('    <priority>0.6</priority>\n')
-                    
-                f.write('  </url>\n')
-            
-            f.write('</urlset>\n')
+            # Higher priority for important files
+            priority_high = 'index' in url_path or url_path.startswith('src-local/')
+            sitemap_parts.append(SITEMAP_URL_TEMPLATES[priority_high] % (BASE_DOMAIN, url_path))
+        sitemap_parts.append('</urlset>\n')
+        
+        sitemap_path.write_text(''.join(sitemap_parts), encoding='utf-8')
         
         debug_print(f"Generated sitemap at {sitemap_path}")
         return True
@@ -1774,6 +2041,44 @@ def create_favicon_files(docs_dir: Path, logos_dir: Path) -> bool:
         print(f"Error creating favicon files: {e}")
         return False
 
+@lru_cache(maxsize=None)
+def ensure_dir(path: Path) -> None:
+    """
+    Creates a directory and its parents if needed.
+    
+    Memoized, so in loops that write many files into the same directories only the first file of each directory makes a mkdir call.
+    """
+    path.mkdir(parents=True, exist_ok=True)
+
+def copy_if_changed(src, dst) -> bool:
+    """
+    Copies a file with shutil.copy2 unless the destination already matches it.
+    
+    A destination with the same size and modification time as the source, as an earlier copy2 of the same file leaves it, is taken to be up to date. This skips the repeated copies of the same JS files into assets/js and unchanged assets on rebuilds.
+    
+    Returns:
+        True if the file was copied, False if the copy was skipped.
+    """
+    try:
+        src_stat = os.stat(src)
+        dst_stat = os.stat(dst)
+        if src_stat.st_size == dst_stat.st_size and src_stat.st_mtime_ns == dst_stat.st_mtime_ns:
+            return False
+    except FileNotFoundError:
+        pass
+    shutil.copy2(src, dst)
+    return True
+
+def iter_tree_copies(src_dir: Path, dest_dir: Path):
+    """
+    Yields (source, destination) pairs for every file under src_dir, with the destination at the same relative path under dest_dir.
+    
+    Walks the tree with iter_files, so no Path objects are built for directories or for the source files.
+    """
+    prefix_len = len(str(src_dir)) + 1
+    for entry in iter_files(src_dir):
+        yield entry.path, dest_dir / entry.path[prefix_len:]
+
 def copy_assets(assets_dir: Path, docs_dir: Path) -> bool:
     """
     Copies all asset files (CSS, JavaScript, images, logos, and favicons) from the source assets directory to the documentation output directory, migrating legacy files and ensuring required assets are present.
@@ -1794,12 +2099,9 @@ def copy_assets(assets_dir: Path, docs_dir: Path) -> bool:
         docs_css_dir.mkdir(exist_ok=True, parents=True)
         
         if css_dir.exists():
-            for css_file in css_dir.glob("**/*"):
-                if css_file.is_file():
-                    rel_path = css_file.relative_to(css_dir)
-                    dest_path = docs_css_dir / rel_path
-                    dest_path.parent.mkdir(exist_ok=True, parents=True)
-                    shutil.copy2(css_file, dest_path)
+            for css_file, dest_path in iter_tree_copies(css_dir, docs_css_dir):
+                ensure_dir(dest_path.parent)
+                if copy_if_changed(css_file, dest_path):
                     debug_print(f"Copied {css_file} to {dest_path}")
         
         # Copy JS files
@@ -1808,16 +2110,13 @@ def copy_assets(assets_dir: Path, docs_dir: Path) -> bool:
         docs_assets_js_dir.mkdir(exist_ok=True, parents=True)
 
         if js_dir.exists():
-            for js_file in js_dir.glob("**/*"):
-                if js_file.is_file():
-                    rel_path = js_file.relative_to(js_dir)
-                    dest_path = docs_assets_js_dir / rel_path
-                    dest_path.parent.mkdir(exist_ok=True, parents=True)
-                    try:
-                        shutil.copy2(js_file, dest_path)
+            for js_file, dest_path in iter_tree_copies(js_dir, docs_assets_js_dir):
+                ensure_dir(dest_path.parent)
+                try:
+                    if copy_if_changed(js_file, dest_path):
                         debug_print(f"Copied {js_file} to {dest_path}")
-                    except Exception as e:
-                        print(f"Error copying JS file {js_file}: {e}")
+                except Exception as e:
+                    print(f"Error copying JS file {js_file}: {e}")
 
         # Handle legacy JS files
         legacy_js_dir = docs_dir / "js"
@@ -1825,7 +2124,7 @@ def copy_assets(assets_dir: Path, docs_dir: Path) -> bool:
             for legacy_file in legacy_js_dir.glob("*"):
                 if legacy_file.is_file():
                     try:
-                        shutil.copy2(legacy_file, docs_assets_js_dir / legacy_file.name)
+                        copy_if_changed(legacy_file, docs_assets_js_dir / legacy_file.name)
                         debug_print(f"Migrated legacy JS file {legacy_file}")
                     except Exception as e:
                         print(f"Error migrating legacy JS file {legacy_file}: {e}")
@@ -1844,7 +2143,7 @@ def copy_assets(assets_dir: Path, docs_dir: Path) -> bool:
             dest_file = docs_assets_js_dir / req_file
             if not dest_file.exists() and src_file.exists():
                 try:
-                    shutil.copy2(src_file, dest_file)
+                    copy_if_changed(src_file, dest_file)
                     debug_print(f"Copied required JS file {src_file}")
                 except Exception as e:
                     print(f"Error copying required JS file {src_file}: {e}")
@@ -1855,12 +2154,9 @@ def copy_assets(assets_dir: Path, docs_dir: Path) -> bool:
         
         if img_dir.exists():
             docs_img_dir.mkdir(exist_ok=True, parents=True)
-            for img_file in img_dir.glob("**/*"):
-                if img_file.is_file():
-                    rel_path = img_file.relative_to(img_dir)
-                    dest_path = docs_img_dir / rel_path
-                    dest_path.parent.mkdir(exist_ok=True, parents=True)
-                    shutil.copy2(img_file, dest_path)
+            for img_file, dest_path in iter_tree_copies(img_dir, docs_img_dir):
+                ensure_dir(dest_path.parent)
+                if copy_if_changed(img_file, dest_path):
                     debug_print(f"Copied {img_file} to {dest_path}")
                     
         # Copy logos
@@ -1869,20 +2165,17 @@ def copy_assets(assets_dir: Path, docs_dir: Path) -> bool:
         
         if logos_dir.exists():
             docs_logos_dir.mkdir(exist_ok=True, parents=True)
-            for logo_file in logos_dir.glob("**/*"):
-                if logo_file.is_file():
-                    rel_path = logo_file.relative_to(logos_dir)
-                    dest_path = docs_logos_dir / rel_path
-                    dest_path.parent.mkdir(exist_ok=True, parents=True)
-                    shutil.copy2(logo_file, dest_path)
+            for logo_file, dest_path in iter_tree_copies(logos_dir, docs_logos_dir):
+                ensure_dir(dest_path.parent)
+                if copy_if_changed(logo_file, dest_path):
                     debug_print(f"Copied {logo_file} to {dest_path}")
         
         # Copy custom CSS to root
         if css_dir.exists():
             custom_styles_path = css_dir / "custom_styles.css"
             if custom_styles_path.exists():
-                shutil.copy2(custom_styles_path, docs_dir / "custom_styles.css")
-                debug_print(f"Copied custom_styles.css to root directory")
+                if copy_if_changed(custom_styles_path, docs_dir / "custom_styles.css"):
+                    debug_print(f"Copied custom_styles.css to root directory")
         
         # Create favicon files
         logos_dir = assets_dir / "logos"
@@ -1894,8 +2187,8 @@ def copy_assets(assets_dir: Path, docs_dir: Path) -> bool:
         if favicon_source_dir.exists() and favicon_source_dir.is_dir():
             for fav_file in favicon_source_dir.glob("*"):
                 if fav_file.is_file():
-                    shutil.copy2(fav_file, docs_dir / fav_file.name)
-                    debug_print(f"Copied {fav_file.name} to root")
+                    if copy_if_changed(fav_file, docs_dir / fav_file.name):
+                        debug_print(f"Copied {fav_file.name} to root")
 
         # Copy Basilisk JS files
         static_js_dir = DARCSIT_DIR / "static" / "js"
@@ -1904,8 +2197,8 @@ def copy_assets(assets_dir: Path, docs_dir: Path) -> bool:
         if static_js_dir.exists() and static_js_dir.is_dir():
             for js_file in static_js_dir.glob("*.js"):
                 try:
-                    shutil.copy2(js_file, docs_assets_js_dir / js_file.name)
-                    debug_print(f"Copied Basilisk JS file: {js_file.name}")
+                    if copy_if_changed(js_file, docs_assets_js_dir / js_file.name):
+                        debug_print(f"Copied Basilisk JS file: {js_file.name}")
                 except Exception as e:
                     print(f"Error copying Basilisk JS file {js_file}: {e}")
 
@@ -1923,112 +2216,172 @@ def main():
     if not validate_config():
         return
     
-    try:
-        # Create docs directory
-        DOCS_DIR.mkdir(exist_ok=True)
-        
-        # Clean docs if force-rebuild enabled
-        if FORCE_REBUILD:
-            print("\nForce rebuild enabled. Cleaning docs directory...")
-            for html_file in DOCS_DIR.rglob('*.html'):
-                try:
-                    html_file.unlink()
-                    debug_print(f"Removed {html_file}")
-                except Exception as e:
-                    print(f"Warning: Could not remove {html_file}: {e}")
-        
-        # Copy assets
-        print("\nCopying assets...")
-        assets_dir = REPO_ROOT / '.github' / 'assets'
-        if not copy_assets(assets_dir, DOCS_DIR):
-            print("Failed to copy assets.")
-            return
-        
-        # Find source files
-        source_files = find_source_files(REPO_ROOT, SOURCE_DIRS)
-        if not source_files:
-            print("No source files found.")
-            return
-        
-        # Dictionary for generated files
-        generated_files = {}
-        
-        # Process each file
-        for file_path in source_files:
-            # Create output path
-            relative_path = file_path.relative_to(REPO_ROOT)
-            output_html_path = DOCS_DIR / relative_path.with_suffix(relative_path.suffix + '.html')
-            
-            # Create output directory
-            output_html_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Skip if not forced and file exists
-            if not FORCE_REBUILD and output_html_path.exists():
-                print(f"  Skipping existing file: {output_html_path.relative_to(DOCS_DIR)}")
-                generated_files[file_path] = output_html_path
+    # Create docs directory
+    DOCS_DIR.mkdir(exist_ok=True)
+    
+    # Clean docs if force-rebuild enabled
+    if FORCE_REBUILD:
+        print("\nForce rebuild enabled. Cleaning docs directory...")
+        for html_file in DOCS_DIR.rglob('*.html'):
+            try:
+                html_file.unlink()
+                debug_print(f"Removed {html_file}")
+            except Exception as e:
+                print(f"Warning: Could not remove {html_file}: {e}")
+    
+    # Copy assets
+    print("\nCopying assets...")
+    assets_dir = REPO_ROOT / '.github' / 'assets'
+    if not copy_assets(assets_dir, DOCS_DIR):
+        print("Failed to copy assets.")
+        return
+    
+    # Find source files
+    source_files = find_source_files(REPO_ROOT, SOURCE_DIRS)
+    if not source_files:
+        print("No source files found.")
+        return
+    
+    # Output path for each source file, in source order
+    output_paths = {}
+    # Files whose existing output is kept, and files to convert
+    ready_files = set()
+    pending_files = []
+    
+    # Source cache entries from the previous build, and those computed now
+    build_cache = load_build_cache(BUILD_CACHE_PATH)
+    source_entries = {}
+    # Skip notices, written in one go after the scan like the workers' logs
+    skip_messages = []
+    
+    for file_path in source_files:
+        # Create output path
+        relative_path = file_path.relative_to(REPO_ROOT)
+        output_html_path = DOCS_DIR / relative_path.with_suffix(relative_path.suffix + '.html')
+        output_paths[file_path] = output_html_path
+        
+        # Create output directory
+        ensure_dir(output_html_path.parent)
+        
+        # Skip if not forced and the existing page is up to date: newer
+        # than its source, or built from the same content (a checkout can
+        # touch timestamps without changing anything). The entry remembers
+        # the timestamp it was hashed at, so an unchanged file is only
+        # hashed once rather than on every build.
+        if not FORCE_REBUILD and output_html_path.exists():
+            if output_html_path.stat().st_mtime_ns >= file_path.stat().st_mtime_ns:
+                up_to_date = True
+            else:
+                cached_entry = build_cache.get(relative_path.as_posix())
+                source_entries[file_path] = source_cache_entry(file_path, cached_entry)
+                up_to_date = (isinstance(cached_entry, dict) and
+                              cached_entry.get('sha1') == source_entries[file_path]['sha1'])
+                if up_to_date:
+                    build_cache[relative_path.as_posix()] = source_entries[file_path]
+            if up_to_date:
+                skip_messages.append(f"  Skipping up-to-date file: {output_html_path.relative_to(DOCS_DIR)}\n")
+                ready_files.add(file_path)
                 continue
-            
-            # Process file
-            if process_file_with_page2html_logic(
-                file_path, 
-                output_html_path, 
-                REPO_ROOT, 
-                BASILISK_DIR, 
-                DARCSIT_DIR, 
-                TEMPLATE_PATH, 
-                BASE_URL, 
-                WIKI_TITLE, 
-                LITERATE_C_SCRIPT,
-                DOCS_DIR
-            ):
-                generated_files[file_path] = output_html_path
-        
-        # Generate folder index pages
-        print("\nGenerating folder index pages...")
-        for source_dir in SOURCE_DIRS:
-            docs_source_dir = DOCS_DIR / source_dir
-            if docs_source_dir.exists():
-                if not generate_directory_index(source_dir, docs_source_dir, generated_files, DOCS_DIR, REPO_ROOT):
-                    print(f"Failed to generate index for {source_dir}.")
-        
-        # Generate main index.html
-        print("\nGenerating main index.html...")
-        if not generate_index(README_PATH, INDEX_PATH, generated_files, DOCS_DIR, REPO_ROOT):
-            print("Failed to generate index.html.")
-            return
         
-        # Generate robots.txt and sitemap
-        print("\nGenerating robots.txt...")
-        generate_robots_txt(DOCS_DIR)
-        
-        print("\nGenerating sitemap...")
-        generate_sitemap(DOCS_DIR, generated_files)
-        
-        print("\nDocumentation generation complete.")
-        print(f"Output generated in: {DOCS_DIR}")
-
-        # Copy Basilisk JS to assets
-        js_src_dir = BASILISK_DIR / 'src' / 'darcsit' / 'static' / 'js'
-        js_dest_dir = DOCS_DIR / 'assets' / 'js'
-        js_dest_dir.mkdir(parents=True, exist_ok=True)
-        for js_file in ['jquery.min.js', 'jquery-ui.packed.js', 'plots.js']:
-            src = js_src_dir / js_file
-            dst = js_dest_dir / js_file
-            if src.exists():
-                shutil.copy2(src, dst)
+        # Hash the source before it is converted, so an edit made while the
+        # pool runs is not recorded as the content the page was built from
+        if file_path not in source_entries:
+            source_entries[file_path] = source_cache_entry(file_path, build_cache.get(relative_path.as_posix()))
+        pending_files.append((file_path, output_html_path))
+    
+    if skip_messages:
+        sys.stdout.write(''.join(skip_messages))
+    
+    # Process files in parallel; each conversion is independent and mostly
+    # waits on its pandoc/literate-c subprocesses. Fork where available so workers
+    # inherit the processed template path and settings; flush first so
+    # they don't re-emit buffered output.
+    common_args = (REPO_ROOT, BASILISK_DIR, DARCSIT_DIR, TEMPLATE_PATH, BASE_URL,
+                   WIKI_TITLE, LITERATE_C_SCRIPT, DOCS_DIR)
+    if pending_files:
+        # Imported here as only a build with pages to convert needs the pool
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        
+        sys.stdout.flush()
+        if 'fork' in multiprocessing.get_all_start_methods():
+            mp_context = multiprocessing.get_context('fork')
+        else:
+            mp_context = None
+        # A forked pool starts all its workers up front, so size it to the
+        # CPUs this process may run on and to the pages left to convert;
+        # an incremental build with a couple of changed pages then forks
+        # a couple of workers rather than one per host core
+        if hasattr(os, 'sched_getaffinity'):
+            cpu_count = len(os.sched_getaffinity(0))
+        else:
+            cpu_count = os.cpu_count() or 1
+        max_workers = min(cpu_count, len(pending_files))
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context) as executor:
+            # Hand out the largest sources first so a long conversion isn't
+            # left running alone at the end; logs still follow source order
+            futures = {}
+            for pending in sorted(pending_files, key=lambda pending: pending[0].stat().st_size, reverse=True):
+                futures[pending[0]] = executor.submit(convert_source_file, pending, common_args)
+            for file_path, _ in pending_files:
+                success, output = futures[file_path].result()
+                if output:
+                    sys.stdout.write(output)
+                if success:
+                    ready_files.add(file_path)
+                    build_cache[file_path.relative_to(REPO_ROOT).as_posix()] = source_entries[file_path]
+    
+    # Keep cache entries only for current sources
+    current_sources = {file_path.relative_to(REPO_ROOT).as_posix() for file_path in source_files}
+    save_build_cache(BUILD_CACHE_PATH, {
+        source: entry for source, entry in build_cache.items() if source in current_sources
+    })
+    
+    # Dictionary for generated files, in source order
+    generated_files = {
+        file_path: output_html_path
+        for file_path, output_html_path in output_paths.items()
+        if file_path in ready_files
+    }
+    
+    # Generate folder index pages
+    print("\nGenerating folder index pages...")
+    for source_dir in SOURCE_DIRS:
+        docs_source_dir = DOCS_DIR / source_dir
+        if docs_source_dir.exists():
+            if not generate_directory_index(source_dir, docs_source_dir, generated_files, DOCS_DIR, REPO_ROOT):
+                print(f"Failed to generate index for {source_dir}.")
+    
+    # Generate main index.html
+    print("\nGenerating main index.html...")
+    if not generate_index(README_PATH, INDEX_PATH, generated_files, DOCS_DIR, REPO_ROOT):
+        print("Failed to generate index.html.")
+        return
+    
+    # Generate robots.txt and sitemap
+    print("\nGenerating robots.txt...")
+    generate_robots_txt(DOCS_DIR)
+    
+    print("\nGenerating sitemap...")
+    generate_sitemap(DOCS_DIR, generated_files)
+    
+    print("\nDocumentation generation complete.")
+    print(f"Output generated in: {DOCS_DIR}")
+
+    # Copy Basilisk JS to assets
+    js_src_dir = BASILISK_DIR / 'src' / 'darcsit' / 'static' / 'js'
+    js_dest_dir = DOCS_DIR / 'assets' / 'js'
+    js_dest_dir.mkdir(parents=True, exist_ok=True)
+    for js_file in ['jquery.min.js', 'jquery-ui.packed.js', 'plots.js']:
+        src = js_src_dir / js_file
+        dst = js_dest_dir / js_file
+        if src.exists():
+            if copy_if_changed(src, dst):
                 print(f"Copied Basilisk JS file {src} to {dst}")
             else:
-                print(f"Warning: Basilisk JS file {src} not found")
-        
-    finally:
-        # Clean up temporary template
-        temp_template_path = TEMPLATE_PATH.parent / (TEMPLATE_PATH.stem.replace('.temp', '') + '.temp.html')
-        if temp_template_path.exists():
-            try:
-                temp_template_path.unlink()
-                debug_print(f"Cleaned up temporary template file")
-            except Exception as e:
-                print(f"Warning: Could not delete temporary template file: {e}")
+                print(f"Skipped Basilisk JS file {src} (up to date)")
+        else:
+            print(f"Warning: Basilisk JS file {src} not found")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -24,6 +24,7 @@ Usage:
 Dependencies:
     - numpy: For numerical operations
     - matplotlib: For visualization
+    - Pillow: For --fastRender frames (installed with matplotlib)
     - multiprocessing: For parallel processing
     - subprocess: For calling external Basilisk utilities
     - argparse: For command-line argument parsing
@@ -31,7 +32,6 @@ Dependencies:
 External Requirements:
     - ./getFacet: Basilisk utility to extract interface facets
     - ./getData: Basilisk utility to extract field data
-    - LaTeX: For rendering mathematical expressions in plots
 
 Author: Vatsal Sanjay
 Email: vatsalsy@comphy-lab.org
@@ -40,28 +40,88 @@ Last updated: Mar 8, 2025
 """
 
 import numpy as np
+import hashlib
+import io
 import os
 import subprocess as sp
+import zipfile
 import matplotlib
+matplotlib.use('Agg')  # Frames are only saved to files, never shown
 import matplotlib.pyplot as plt
+from matplotlib import font_manager
 from matplotlib.collections import LineCollection
 from matplotlib.ticker import StrMethodFormatter
+from PIL import Image, ImageDraw, ImageFont
 import multiprocessing as mp
-from functools import partial
+from functools import partial, wraps
 import argparse
 import sys
 
 # ===============================
 # Matplotlib Configuration
 # ===============================
+# Math is typeset by matplotlib's own mathtext in Computer Modern, which
+# looks like LaTeX output without running LaTeX for every frame's title
 matplotlib.rcParams['font.family'] = 'serif'
-matplotlib.rcParams['text.usetex'] = True
-matplotlib.rcParams['text.latex.preamble'] = r'\usepackage{amsmath}'
+matplotlib.rcParams['text.usetex'] = False
+matplotlib.rcParams['mathtext.fontset'] = 'cm'
 
 # ===============================
 # Data Extraction Functions
 # ===============================
 
+def disk_cached(func):
+    """
+    Cache the arrays an extraction function returns on disk (--cacheData).
+    
+    The decorated function takes an extra keyword argument cache_dir. When it
+    is given, the result is stored in cache_dir as an .npz file named after a
+    hash of the function, the positional and keyword arguments and the
+    snapshot's modification time, and later calls with the same arguments
+    load it back instead of running the Basilisk utility and parsing its
+    output again. Without cache_dir the function runs as usual.
+    
+    Args:
+        func (callable): Function taking the snapshot file name first and
+                         returning an array or a tuple of arrays and numbers
+    
+    Returns:
+        callable: The wrapped function
+    """
+    @wraps(func)
+    def wrapper(filename, *args, cache_dir=None, **kwargs):
+        if cache_dir is None:
+            return func(filename, *args, **kwargs)
+        
+        key = repr((func.__name__, os.path.abspath(filename), os.path.getmtime(filename), args,
+                    sorted(kwargs.items())))
+        path = os.path.join(cache_dir, hashlib.sha1(key.encode()).hexdigest() + ".npz")
+        
+        try:
+            with np.load(path) as data:
+                values = [data[f"arr_{i}"] for i in range(len(data.files) - 1)]
+                values = [v.item() if v.ndim == 0 else v for v in values]
+                return tuple(values) if data["is_tuple"] else values[0]
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            pass
+        
+        result = func(filename, *args, **kwargs)
+        is_tuple = isinstance(result, tuple)
+        
+        # Write to a temporary file first so an interrupted run never
+        # leaves a partial cache entry behind
+        os.makedirs(cache_dir, exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as f:
+            np.savez(f, *(result if is_tuple else (result,)), is_tuple=is_tuple)
+        os.replace(temporary, path)
+        
+        return result
+    
+    return wrapper
+
+
+@disk_cached
 def gettingFacets(filename, includeCoat='true'):
     """
     Extract interface facets from a Basilisk snapshot file.
@@ -79,8 +139,9 @@ def gettingFacets(filename, includeCoat='true'):
                                    Defaults to 'true'.
     
     Returns:
-        list: List of line segments, where each segment is a tuple of two points
-              ((r1, z1), (r2, z2)). Returns empty list if file has insufficient data.
+        numpy.ndarray: Line segments as an (M, 2, 2) array, where each segment
+              holds two points ((r1, z1), (r2, z2)). Returns empty list if file
+              has insufficient data.
     
     Raises:
         subprocess.CalledProcessError: If getFacet utility fails
@@ -89,41 +150,29 @@ def gettingFacets(filename, includeCoat='true'):
         >>> facets = gettingFacets("snapshot-0.1000")
         >>> print(f"Found {len(facets)} facet segments")
     """
-    # Execute the getFacet utility
+    # Execute the getFacet utility; Basilisk utilities output to stderr
     exe = ["./getFacet", filename, includeCoat]
-    p = sp.Popen(exe, stdout=sp.PIPE, stderr=sp.PIPE)
-    stdout, stderr = p.communicate()
-    
-    # Parse the output from stderr (Basilisk utilities output to stderr)
-    temp1 = stderr.decode("utf-8")
-    temp2 = temp1.split("\n")
-    segs = []
-    skip = False
-    
-    # Only process if we have substantial output (>100 lines indicates valid data)
-    if (len(temp2) > 1e2):
-        for n1 in range(len(temp2)):
-            temp3 = temp2[n1].split(" ")
-            if temp3 == ['']:
-                skip = False
-                pass
-            else:
-                if not skip:
-                    # Parse the next line for the second point of the segment
-                    temp4 = temp2[n1+1].split(" ")
-                    # Note: getFacet outputs in (z, r) format, we convert to (r, z)
-                    r1, z1 = np.array([float(temp3[1]), float(temp3[0])])
-                    r2, z2 = np.array([float(temp4[1]), float(temp4[0])])
-                    
-                    # Add the original segment
-                    segs.append(((r1, z1), (r2, z2)))
-                    # Mirror across r=0 for axisymmetric visualization
-                    segs.append(((-r1, z1), (-r2, z2)))
-                    skip = True
-    
-    return segs
+    stderr = sp.run(exe, stdout=sp.DEVNULL, stderr=sp.PIPE).stderr
+    
+    # Only use substantial output (>100 lines indicates valid data)
+    if stderr.count(b"\n") + 1 <= 1e2:
+        return []
+    
+    # Each facet is written as its two end points on consecutive lines,
+    # followed by a blank line, so the points parsed in one go (blank lines
+    # are skipped) pair up into segments
+    # Note: getFacet outputs in (z, r) format, we convert to (r, z)
+    points = np.loadtxt(io.BytesIO(stderr), usecols=(0, 1), ndmin=2)
+    segs = points[:, ::-1].reshape(-1, 2, 2)
+    
+    # Mirror across r=0 for axisymmetric visualization, each mirrored
+    # segment following its original
+    mirrored = segs.copy()
+    mirrored[..., 0] *= -1
+    return np.stack((segs, mirrored), axis=1).reshape(-1, 2, 2)
 
 
+@disk_cached
 def gettingfield(filename, zmin, zmax, rmax, nr):
     """
     Extract field data from a Basilisk snapshot within specified bounds.
@@ -154,49 +203,285 @@ def gettingfield(filename, zmin, zmax, rmax, nr):
         >>> R, Z, T, nz = gettingfield("snapshot-0.1000", 0, 4, 2, 256)
         >>> print(f"Grid size: {nz} x {nr}")
     """
-    # Execute the getData utility with specified bounds
+    # Execute the getData utility with specified bounds. With --binary it
+    # writes the grid as raw doubles to stdout, which needs no formatting or
+    # parsing; a getData built before that option rejects it, and then its
+    # text output on stderr is parsed by numpy's C reader as it arrives
     exe = ["./getData", filename, str(zmin), str(0), str(zmax), str(rmax), str(nr)]
-    p = sp.Popen(exe, stdout=sp.PIPE, stderr=sp.PIPE)
-    stdout, stderr = p.communicate()
-    
-    # Parse the output
-    temp1 = stderr.decode("utf-8")
-    temp2 = temp1.split("\n")
-    Rtemp, Ztemp, Ttemp = [], [], []
-    
-    # Extract data points from output
-    for n1 in range(len(temp2)):
-        temp3 = temp2[n1].split(" ")
-        if temp3 == ['']:
-            pass
-        else:
-            # getData outputs in (z, r, field) format
-            Ztemp.append(float(temp3[0]))
-            Rtemp.append(float(temp3[1]))
-            Ttemp.append(float(temp3[2]))
+    binary = sp.run(exe + ["--binary"], stdout=sp.PIPE, stderr=sp.DEVNULL)
     
-    # Convert to numpy arrays
-    R = np.asarray(Rtemp)
-    Z = np.asarray(Ztemp)
-    T = np.asarray(Ttemp)
+    if binary.returncode == 0:
+        data = np.frombuffer(binary.stdout, dtype=np.float64).reshape(-1, 3)
+    else:
+        # Extract data points from output, skipping blank lines
+        with sp.Popen(exe, stdout=sp.DEVNULL, stderr=sp.PIPE) as p:
+            data = np.loadtxt(p.stderr, usecols=(0, 1, 2), ndmin=2)
     
     # Calculate grid dimensions
-    nz = int(len(Z)/nr)
+    nz = int(len(data)/nr)
     print("nz is %d" % nz)
     
-    # Reshape into 2D grids for visualization
-    R.resize((nz, nr))
-    Z.resize((nz, nr))
-    T.resize((nz, nr))
+    # Reshape into 2D grids for visualization. These are views of the one
+    # array read above, so nothing is copied; getData outputs in
+    # (z, r, field) format
+    Z, R, T = data[:nz*nr].reshape(nz, nr, 3).transpose(2, 0, 1)
     
     return R, Z, T, nz
 
 
+def field_extent(zmin, zmax, rmax, nr, nz):
+    """
+    Bounds of the grid gettingfield samples, without scanning the arrays.
+    
+    getData samples the middle of each cell of an nz x nr grid covering
+    [zmin, zmax] x [0, rmax], so the extreme coordinates follow from the grid
+    spacing. They are computed the same way getData computes them, and
+    therefore equal Z.min(), Z.max(), R.min() and R.max().
+    
+    Args:
+        zmin (float): Minimum z-coordinate passed to gettingfield
+        zmax (float): Maximum z-coordinate passed to gettingfield
+        rmax (float): Maximum radial coordinate passed to gettingfield
+        nr (int): Number of grid points in the radial direction
+        nz (int): Number of grid points in the axial direction
+        
+    Returns:
+        list: [rmin, rmax, zmin, zmax] of the cell centres, as used for the
+              imshow extent
+    """
+    Deltar = rmax/nr
+    Deltaz = (zmax - zmin)/nz
+    return [Deltar*0.5, Deltar*(nr - 0.5), Deltaz*0.5 + zmin, Deltaz*(nz - 0.5) + zmin]
+
+
 # ===============================
 # Visualization Functions
 # ===============================
 
-def process_timestep(ti, caseToProcess, folder, tsnap, GridsPerR, rmin, rmax, zmin, zmax, lw):
+# Figure, axes and artists each worker process reuses for all of its frames,
+# and the area of the figure saved for each frame
+_FIG = None
+_AX = None
+_ARTISTS = None
+_BBOX = None
+
+
+def get_figure(lw):
+    """
+    Return the figure, axes and artists to draw the next frame with.
+    
+    Everything is created on the first call in each process, in the order it
+    is drawn: the domain boundaries, the interface facets and the field.
+    Later frames only update the artists' data, instead of clearing the axes
+    and building a new set of artists for every frame.
+    
+    Args:
+        lw (float): Line width for plotting boundaries
+        
+    Returns:
+        tuple: (matplotlib.figure.Figure, matplotlib.axes.Axes, artists), where
+               artists holds the list of the five boundary lines (symmetry
+               axis first), the facet LineCollection and the field AxesImage
+    """
+    global _FIG, _AX, _ARTISTS
+    if _FIG is None:
+        _FIG, _AX = plt.subplots()
+        _FIG.set_size_inches(19.20, 10.80)  # Full HD resolution
+        
+        # Domain boundaries and axis of symmetry, positioned for each frame
+        boundaries = _AX.plot([], [], '-.', color='grey', linewidth=lw)  # Symmetry axis
+        for _ in range(4):
+            boundaries += _AX.plot([], [], '-', color='black', linewidth=lw)
+        
+        # Interface facets as a collection for efficiency
+        line_segments = LineCollection([], linewidths=4, colors='blue', linestyle='solid')
+        _AX.add_collection(line_segments)
+        
+        # Temperature/scalar field visualization
+        image = _AX.imshow(np.zeros((1, 1)), interpolation='Bilinear', cmap='hot_r', origin='lower',
+                           vmax=1.0, vmin=0.0)
+        
+        _AX.set_aspect('equal')
+        _AX.axis('off')  # Remove axes for cleaner visualization
+        _ARTISTS = (boundaries, line_segments, image)
+    return _FIG, _AX, _ARTISTS
+
+
+def frame_title(t):
+    """
+    Title of the frame at physical time t.
+    
+    Args:
+        t (float): Physical time of the frame
+        
+    Returns:
+        str: Title text, in matplotlib mathtext
+    """
+    return f'$t/\\tau_\\gamma$ = {t:4.3f}'
+
+
+def get_frame_bbox(fig, ax, tmax):
+    """
+    Return the area of the figure to save for the current frame.
+    
+    On the first call in each process this measures the tight bounding box,
+    padded as bbox_inches="tight" pads it, and later frames reuse it. Saving
+    with a fixed box skips the extra draw that "tight" needs to measure the
+    figure on every frame. All the artists except the title are clipped to
+    the axes, so only the title changes from frame to frame; on a narrow
+    domain it can be wider than the axes. The box is therefore measured with
+    both the current title and the widest one of the run, that of the last
+    frame at tmax, so no later title is cut off.
+    
+    Args:
+        fig (matplotlib.figure.Figure): Figure with the frame drawn on it
+        ax (matplotlib.axes.Axes): Axes holding the frame's title
+        tmax (float): Physical time of the last frame of the run
+        
+    Returns:
+        matplotlib.transforms.Bbox: Area to save, in inches
+    """
+    global _BBOX
+    if _BBOX is None:
+        fig.draw_without_rendering()
+        boxes = [fig.get_tightbbox()]
+        title = ax.title.get_text()
+        ax.title.set_text(frame_title(tmax))
+        fig.draw_without_rendering()
+        boxes.append(fig.get_tightbbox())
+        ax.title.set_text(title)
+        _BBOX = matplotlib.transforms.Bbox.union(boxes).padded(matplotlib.rcParams['savefig.pad_inches'])
+    return _BBOX
+
+
+def frame_filename(t):
+    """
+    Name of the image file for the frame at physical time t.
+    
+    Args:
+        t (float): Physical time of the frame
+        
+    Returns:
+        str: 8-digit zero-padded file name, e.g. "00001000.png" for t=1.0
+    """
+    return f"{int(t*1000):08d}.png"
+
+
+# ===============================
+# Fast Rendering (--fastRender)
+# ===============================
+# Largest size of the plotted domain in pixels, and the blank margin around it
+FAST_MAX_WIDTH, FAST_MAX_HEIGHT = 1920, 1000
+FAST_MARGIN = 20
+# matplotlib sizes lines and text in points, drawn at its default 100 dpi
+PIXELS_PER_POINT = 100 / 72
+
+
+def render_frame_fast(name, T, extent, segs, t, rmin, rmax, zmin, zmax, lw):
+    """
+    Draw a frame directly with Pillow, bypassing matplotlib.
+
+    The field is colormapped with numpy into an RGBA array and resampled
+    bilinearly onto the domain, and the boundaries and facets are drawn with
+    ImageDraw, so there is no artist tree to lay out and draw and the PNG is
+    written at low compression. The field and facets are drawn on an image
+    the size of the domain, which clips them to it as matplotlib clips them
+    to the axes. The frame shows the same content as the matplotlib one, but
+    it is not pixel-identical: the title is plain text and the frame is sized
+    to the domain rather than cropped to the drawing.
+
+    Args:
+        name (str): Path of the image file to write
+        T (numpy.ndarray): 2D field values (nz x nr), lowest z first
+        extent (list): [rmin, rmax, zmin, zmax] covered by the field
+        segs (numpy.ndarray): Interface facets as an (M, 2, 2) array of
+            ((r1, z1), (r2, z2)) segments
+        t (float): Physical time of the frame, shown in the title
+        rmin, rmax, zmin, zmax (float): Plotted domain
+        lw (float): Line width for the boundaries, in points
+
+    Returns:
+        None: Saves image to disk
+    """
+    # Pixels per unit length, with the domain fitting in the frame
+    scale = min(FAST_MAX_WIDTH / (rmax - rmin), FAST_MAX_HEIGHT / (zmax - zmin))
+    font = ImageFont.truetype(font_manager.findfont('serif'), round(20 * PIXELS_PER_POINT))
+    title_height = font.size * 2
+
+    # H.264 encoders need even frame dimensions
+    width = 2 * round(((rmax - rmin) * scale + 2 * FAST_MARGIN) / 2)
+    height = 2 * round(((zmax - zmin) * scale + 2 * FAST_MARGIN + title_height) / 2)
+
+    # Top-left corner of the domain in the frame, and pixel coordinates
+    # within the domain and within the frame
+    domain_x, domain_y = FAST_MARGIN, FAST_MARGIN + title_height
+
+    def to_domain_pixels(r, z):
+        return (r - rmin) * scale, (zmax - z) * scale
+
+    def to_pixels(r, z):
+        x, y = to_domain_pixels(r, z)
+        return domain_x + x, domain_y + y
+
+    image = Image.new('RGB', (width, height), 'white')
+    domain = Image.new('RGB', (round((rmax - rmin) * scale), round((zmax - zmin) * scale)), 'white')
+
+    # Field: colormap, flip so the lowest z is at the bottom, and stretch
+    # onto its extent
+    rgba = plt.get_cmap('hot_r')(np.clip(T, 0.0, 1.0)[::-1], bytes=True)
+    left, top = to_domain_pixels(extent[0], extent[3])
+    right, bottom = to_domain_pixels(extent[1], extent[2])
+    field = Image.fromarray(rgba).convert('RGB').resize(
+        (max(1, round(right - left)), max(1, round(bottom - top))), Image.BILINEAR)
+    domain.paste(field, (round(left), round(top)))
+
+    # Interface facets, with all end points converted to pixels at once;
+    # anything outside the domain falls off the domain image
+    facet_width = round(4 * PIXELS_PER_POINT)
+    facet_x, facet_y = to_domain_pixels(segs[..., 0], segs[..., 1])
+    domain_draw = ImageDraw.Draw(domain)
+    for x_pair, y_pair in zip(facet_x.tolist(), facet_y.tolist()):
+        domain_draw.line(list(zip(x_pair, y_pair)), fill='blue', width=facet_width)
+
+    image.paste(domain, (domain_x, domain_y))
+    draw = ImageDraw.Draw(image)
+
+    # Domain boundaries
+    line_width = max(1, round(lw * PIXELS_PER_POINT))
+    corners = [to_pixels(rmin, zmin), to_pixels(rmax, zmin), to_pixels(rmax, zmax),
+               to_pixels(rmin, zmax), to_pixels(rmin, zmin)]
+    draw.line(corners, fill='black', width=line_width)
+
+    # Symmetry axis, dash-dotted with matplotlib's '-.' pattern
+    x, y = to_pixels(0, zmax)
+    _, y_end = to_pixels(0, zmin)
+    pattern = [(6.4, True), (1.6, False), (1.0, True), (1.6, False)]
+    i = 0
+    while y < y_end:
+        length, drawn = pattern[i % len(pattern)]
+        y_next = min(y + length * line_width, y_end)
+        if drawn:
+            draw.line([(x, y), (x, y_next)], fill='grey', width=line_width)
+        y = y_next
+        i += 1
+
+    # Title, with the gamma as a subscript
+    small_font = font.font_variant(size=round(font.size * 0.7))
+    label = 't/τ'
+    value = f' = {t:4.3f}'
+    label_width = draw.textlength(label, font=font)
+    sub_width = draw.textlength('γ', font=small_font)
+    x = (width - label_width - sub_width - draw.textlength(value, font=font)) / 2
+    y = title_height / 4
+    draw.text((x, y), label, font=font, fill='black')
+    draw.text((x + label_width, y + font.size * 0.45), 'γ', font=small_font, fill='black')
+    draw.text((x + label_width + sub_width, y), value, font=font, fill='black')
+
+    image.save(name, compress_level=1)
+
+
+def process_timestep(ti, caseToProcess, folder, tsnap, GridsPerR, rmin, rmax, zmin, zmax, lw, fast=False,
+                     cache=False, tmax=None):
     """
     Process and visualize a single timestep from the simulation.
     
@@ -221,6 +506,13 @@ def process_timestep(ti, caseToProcess, folder, tsnap, GridsPerR, rmin, rmax, zm
         zmin (float): Minimum axial coordinate for plotting
         zmax (float): Maximum axial coordinate for plotting
         lw (float): Line width for plotting boundaries
+        fast (bool, optional): Draw the frame with render_frame_fast instead
+                               of matplotlib. Defaults to False.
+        cache (bool, optional): Keep the extracted facets and field in
+                                {folder}/.cache for later runs. Defaults to False.
+        tmax (float, optional): Physical time of the last frame of the run,
+                                whose title is the widest the saved area must
+                                fit. Defaults to the time of this frame.
         
     Returns:
         None: Saves image to disk
@@ -237,7 +529,7 @@ def process_timestep(ti, caseToProcess, folder, tsnap, GridsPerR, rmin, rmax, zm
     # Calculate physical time for this timestep
     t = tsnap * ti
     place = f"{caseToProcess}/intermediate/snapshot-{t:.4f}"
-    name = f"{folder}/{int(t*1000):08d}.png"
+    name = f"{folder}/{frame_filename(t)}"
     
     # Check if snapshot file exists
     if not os.path.exists(place):
@@ -249,10 +541,12 @@ def process_timestep(ti, caseToProcess, folder, tsnap, GridsPerR, rmin, rmax, zm
         print(f"{name} Image present!")
         return
     
+    cache_dir = f"{folder}/.cache" if cache else None
+    
     # Extract interface facets
-    segs = gettingFacets(place)
+    segs = gettingFacets(place, cache_dir=cache_dir)
     
-    if not segs:
+    if len(segs) == 0:
         print(f"Problem in the available file {place}")
         return
     
@@ -260,41 +554,45 @@ def process_timestep(ti, caseToProcess, folder, tsnap, GridsPerR, rmin, rmax, zm
     nr = int(GridsPerR * rmax)
     
     # Extract field data
-    R, Z, T, nz = gettingfield(place, zmin, zmax, rmax, nr)
-    zminp, zmaxp, rminp, rmaxp = Z.min(), Z.max(), R.min(), R.max()
+    R, Z, T, nz = gettingfield(place, zmin, zmax, rmax, nr, cache_dir=cache_dir)
+    rminp, rmaxp, zminp, zmaxp = field_extent(zmin, zmax, rmax, nr, nz)
+    
+    if fast:
+        render_frame_fast(name, T, [rminp, rmaxp, zminp, zmaxp], segs, t, rmin, rmax, zmin, zmax, lw)
+        return
     
     # ===============================
     # Plotting Configuration
     # ===============================
     AxesLabel, TickLabel = 50, 20
-    fig, ax = plt.subplots()
-    fig.set_size_inches(19.20, 10.80)  # Full HD resolution
-    
-    # Plot domain boundaries and axis of symmetry
-    ax.plot([0, 0], [zmin, zmax], '-.', color='grey', linewidth=lw)  # Symmetry axis
-    ax.plot([rmin, rmin], [zmin, zmax], '-', color='black', linewidth=lw)  # Left boundary
-    ax.plot([rmin, rmax], [zmin, zmin], '-', color='black', linewidth=lw)  # Bottom boundary
-    ax.plot([rmin, rmax], [zmax, zmax], '-', color='black', linewidth=lw)  # Top boundary
-    ax.plot([rmax, rmax], [zmin, zmax], '-', color='black', linewidth=lw)  # Right boundary
-    
-    # Add interface facets as a collection for efficiency
-    line_segments = LineCollection(segs, linewidths=4, colors='blue', linestyle='solid')
-    ax.add_collection(line_segments)
-    
-    # Create temperature/scalar field visualization
-    cntrl2 = ax.imshow(T, interpolation='Bilinear', cmap='hot_r', origin='lower', 
-                       extent=[rminp, rmaxp, zminp, zmaxp], vmax=1.0, vmin=0.0)
+    fig, ax, (boundaries, line_segments, image) = get_figure(lw)
+    
+    # Position domain boundaries and axis of symmetry
+    boundary_coordinates = [
+        ([0, 0], [zmin, zmax]),  # Symmetry axis
+        ([rmin, rmin], [zmin, zmax]),  # Left boundary
+        ([rmin, rmax], [zmin, zmin]),  # Bottom boundary
+        ([rmin, rmax], [zmax, zmax]),  # Top boundary
+        ([rmax, rmax], [zmin, zmax]),  # Right boundary
+    ]
+    for line, (r, z) in zip(boundaries, boundary_coordinates):
+        line.set_data(r, z)
+    
+    # Update interface facets and temperature/scalar field
+    line_segments.set_segments(segs)
+    image.set_data(T)
+    image.set_extent([rminp, rmaxp, zminp, zmaxp])
     
     # Configure plot appearance
-    ax.set_aspect('equal')
     ax.set_xlim(rmin, rmax)
     ax.set_ylim(zmin, zmax)
-    ax.set_title(f'$t/\\tau_\\gamma$ = {t:4.3f}', fontsize=TickLabel)
-    ax.axis('off')  # Remove axes for cleaner visualization
+    ax.set_title(frame_title(t), fontsize=TickLabel)
     
-    # Save figure with tight layout
-    plt.savefig(name, bbox_inches="tight")
-    plt.close()
+    # Save the tightly cropped figure; the figure stays open for the next frame.
+    # Low PNG compression: encoding dominates the save time at level 6, and
+    # the frames are only kept until they are encoded into a video
+    fig.savefig(name, bbox_inches=get_frame_bbox(fig, ax, t if tmax is None else tmax),
+                pil_kwargs={'compress_level': 1})
 
 
 # ===============================
@@ -338,6 +636,12 @@ def main():
                        help='Path to simulation case directory')
     parser.add_argument('--folderToSave', type=str, default='Video', 
                        help='Output directory for images')
+    parser.add_argument('--fastRender', action='store_true',
+                       help='Draw frames directly with Pillow instead of matplotlib '
+                            '(faster, with a plain-text title)')
+    parser.add_argument('--cacheData', action='store_true',
+                       help='Keep the extracted facets and fields in <folderToSave>/.cache '
+                            'so later runs skip getFacet/getData (uses disk space)')
     
     args = parser.parse_args()
     
@@ -363,11 +667,19 @@ def main():
         os.makedirs(folder)
         print(f"Created output directory: {folder}")
     
+    # Skip timesteps whose image is already present (useful for resuming
+    # interrupted runs), listing the folder once rather than having the
+    # workers check for each image in turn
+    existing_images = set(os.listdir(folder))
+    timesteps = [ti for ti in range(nGFS) if frame_filename(tsnap * ti) not in existing_images]
+    if len(timesteps) < nGFS:
+        print(f"Skipping {nGFS - len(timesteps)} timesteps with images present")
+    
     # ===============================
     # Parallel Processing
     # ===============================
     print(f"Starting parallel processing with {num_processes} CPUs...")
-    print(f"Processing {nGFS} timesteps from {caseToProcess}")
+    print(f"Processing {len(timesteps)} timesteps from {caseToProcess}")
     
     # Create a pool of worker processes
     with mp.Pool(processes=num_processes) as pool:
@@ -382,11 +694,16 @@ def main():
                              rmax=rmax, 
                              zmin=zmin, 
                              zmax=zmax, 
-                             lw=lw)
+                             lw=lw,
+                             fast=args.fastRender,
+                             cache=args.cacheData,
+                             tmax=tsnap * (nGFS - 1))
         
         # Map the process function to all timesteps
-        # This distributes the work across available CPUs
-        pool.map(process_func, range(nGFS))
+        # This distributes the work across available CPUs one timestep at a
+        # time, so a worker that finishes early picks up the next frame
+        # instead of the frames being split into large fixed batches up front
+        pool.map(process_func, timesteps, chunksize=1)
     
     print(f"Processing complete! Images saved to {folder}/")
     print("To create a video from images, use:")
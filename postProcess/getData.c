@@ -9,10 +9,11 @@ Extract and interpolate field data from Basilisk snapshots onto a regular grid.
 
 ## Usage
 ```bash
-./getData <filename> <xmin> <ymin> <xmax> <ymax> <ny>
+./getData <filename> <xmin> <ymin> <xmax> <ymax> <ny> [--binary]
 ```
 
-Output: Grid data (x, y, field_values) to stderr
+Output: Grid data (x, y, field_values) to stderr, or with `--binary` as raw
+doubles (one x, y, field_values row per point) to stdout
 */
 
 #include "utils.h"
@@ -41,18 +42,20 @@ Extract simulation data and interpolate onto a regular grid.
 - `xmin`, `ymin`: Lower bounds of extraction region
 - `xmax`, `ymax`: Upper bounds of extraction region  
 - `ny`: Number of grid points in y-direction
+- `--binary` (optional): Write raw doubles to stdout instead of text
 
 ### Process
 1. Parse arguments and validate input
 2. Load simulation and normalize T field
 3. Create uniform grid with spacing Deltay
 4. Interpolate fields onto grid points
-5. Output grid data to stderr
+5. Output grid data to stderr, or to stdout in binary
 */
 int main(int a, char const *arguments[]) {
-  if (a != 7) {
+  bool binary = (a == 8 && !strcmp(arguments[7], "--binary"));
+  if (a != 7 && !binary) {
     fprintf(stderr, "Error: Expected 6 arguments\n");
-    fprintf(stderr, "Usage: %s <filename> <xmin> <ymin> <xmax> <ymax> <ny>\n", 
+    fprintf(stderr, "Usage: %s <filename> <xmin> <ymin> <xmax> <ymax> <ny> [--binary]\n", 
             arguments[0]);
     return 1;
   }
@@ -96,10 +99,18 @@ int main(int a, char const *arguments[]) {
   }
 
   /* Output interpolated data */
+  if (binary)
+    fp = stdout;
   for (int i = 0; i < nx; i++) {
     double x = Deltax*(i+1./2) + xmin;
     for (int j = 0; j < ny; j++) {
       double y = Deltay*(j+1./2) + ymin;
+      if (binary) {
+        double point[2] = {x, y};
+        fwrite(point, sizeof(double), 2, fp);
+        fwrite(&field[i][len*j], sizeof(double), len, fp);
+        continue;
+      }
       fprintf(fp, "%g %g", x, y);
       int k = 0;
       for (scalar s in list) {